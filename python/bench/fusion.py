@@ -0,0 +1,52 @@
+# How many trips round the fast engine's dispatch loop its superinstructions save (see
+# Superinstructions in computer.py)
+#   python bench/fusion.py [day9] [day13] [day19] [day23]
+# Each run uses the profile engine to count the instructions executed, then adds up how many of
+# them were the first of a pair the fast engine runs together.
+import sys, time
+import programs
+from computer import Computer, fused_with_next
+
+def fused (computers):
+    # (instructions run, how many of them had the next one fused on)
+    steps = pairs = 0
+    for c in computers:
+        steps += c.profile.steps
+        pairs += sum(n for ip, n in c.profile.ip_counts.items() if fused_with_next(c.memory, ip))
+    return steps, pairs
+
+def day9 ():
+    # BOOST in sensor boost mode
+    c = Computer(programs.day9(), inputs=[2], engine="profile")
+    c.run()
+    return [c]
+
+def day13 ():
+    # The whole game, keeping the paddle under the ball
+    return [programs.day13_game(programs.day13(), "profile")[0]]
+
+def day19 ():
+    # Every probe of the 50x50 scan
+    computers = []
+    for y in range(50):
+        for x in range(50):
+            c = Computer(programs.day19(), inputs=[x, y], engine="profile")
+            c.run()
+            computers.append(c)
+    return computers
+
+def day23 ():
+    # The network, until the NAT sends the same y twice in a row
+    return programs.day23_network(programs.day23(), "profile")[0]
+
+RUNS = { "day9" : day9, "day13" : day13, "day19" : day19, "day23" : day23 }
+
+def main (names):
+    for name in names or RUNS:
+        start = time.perf_counter()
+        steps, pairs = fused(RUNS[name]())
+        print("{:6} {:10} instructions {:10} dispatches  {:5.1%} fewer  ({:.1f}s)".format(
+            name, steps, steps - pairs, pairs / steps, time.perf_counter() - start))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
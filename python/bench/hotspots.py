@@ -0,0 +1,22 @@
+# Where a puzzle program spends its steps, using the profile engine
+#   python bench/hotspots.py [day9|day19] [--collapsed file]
+# With --collapsed, also writes the steps in flamegraph.pl's format, e.g.
+#   python bench/hotspots.py day9 --collapsed day9.folded && flamegraph.pl day9.folded > day9.svg
+import sys
+import programs
+from computer import Computer
+
+RUNS = { "day9" : (programs.day9, [2]),     # BOOST, sensor boost mode
+         "day19" : (programs.day19, [20, 30]) }  # One tractor beam probe
+
+def main (args):
+    name = args[0] if args else "day9"
+    load, inputs = RUNS[name]
+    c = Computer(load(), inputs=list(inputs), engine="profile")
+    c.run()
+    print(c.profile.report())
+    if "--collapsed" in args:
+        c.profile.dump(args[args.index("--collapsed") + 1], collapsed=True)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
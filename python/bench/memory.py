@@ -0,0 +1,43 @@
+# Memory used by 1000 live Computers, with list memory and with compact (array) memory
+#   python bench/memory.py [number of computers]
+import sys, time, tracemalloc
+import programs
+from computer import Computer
+
+def day19_probe (program, i, compact):
+    # One tractor beam probe, run to completion
+    c = Computer(program, inputs=[i % 50, i // 50], engine="fast", compact=compact)
+    c.run()
+    return c
+
+def day9_self_test (program, i, compact):
+    # BOOST in test mode, run to completion
+    c = Computer(program, inputs=[1], engine="fast", compact=compact)
+    c.run()
+    return c
+
+def measure (make, program, n, compact):
+    # Returns (bytes allocated by the live Computers, seconds taken)
+    tracemalloc.start()
+    start = time.perf_counter()
+    computers = [make(program, i, compact) for i in range(n)]
+    elapsed = time.perf_counter() - start
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del computers
+    return size, elapsed
+
+def main (n):
+    for name, make, program in [("day 19 probe", day19_probe, programs.day19()),
+                                ("day 9 self-test", day9_self_test, programs.day9())]:
+        print("{} x {} ({} word program)".format(name, n, len(program)))
+        results = {}
+        for compact in (False, True):
+            size, elapsed = measure(make, program, n, compact)
+            results[compact] = size
+            print("  {:8} {:8.1f} KiB total {:6.1f} KiB each  {:.2f}s".format(
+                "compact" if compact else "list", size / 1024, size / 1024 / n, elapsed))
+        print("  compact uses {:.0%} of list".format(results[True] / results[False]))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
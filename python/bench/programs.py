@@ -0,0 +1,76 @@
+# Puzzle programs for the benchmarks: the day scripts' .intcode images, and day 9's list from
+# computer.py pulled out without running it - and the workloads more than one benchmark runs
+import ast, os, sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PYTHON_DIR = os.path.dirname(HERE)
+sys.path.insert(0, PYTHON_DIR)  # So the benchmarks can import computer
+from computer import Computer, Network, ProgramImage
+
+def load_program (script, name):
+    # Find the list literal assigned to name (anywhere) in script, e.g. load_program("day19.py", "program")
+    with open(os.path.join(PYTHON_DIR, script)) as f:
+        tree = ast.parse(f.read())
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.List):
+            if any(isinstance(t, ast.Name) and t.id == name for t in node.targets):
+                return ast.literal_eval(node.value)
+
+    raise KeyError("No list {} in {}".format(name, script))
+
+def day9 ():   return load_program("computer.py", "DAY_9_PROGRAM")
+
+def load_literal (script, name):
+    # The value of the last literal assigned to name at the top level of script - the one the
+    # script ends up using, e.g. load_literal("day25.py", "all_items")
+    with open(os.path.join(PYTHON_DIR, script)) as f:
+        tree = ast.parse(f.read())
+
+    values = [node.value for node in tree.body if isinstance(node, ast.Assign)
+              and any(isinstance(t, ast.Name) and t.id == name for t in node.targets)]
+    if not values:
+        raise KeyError("No {} in {}".format(name, script))
+    return ast.literal_eval(values[-1])
+
+def image (script):
+    # A fresh list each time, so callers can patch it, e.g. image("day13")[0] = 2
+    return list(ProgramImage.load(os.path.join(PYTHON_DIR, script + ".intcode")).words)
+
+def day13 ():  return image("day13")
+def day15 ():  return image("day15")
+def day19 ():  return image("day19")
+def day23 ():  return image("day23")
+def day25 ():  return image("day25")
+def day25_route ():  return load_literal("day25.py", "get_all_and_goto_checkpoint").split("\n")[:-1]  # As day25.py uses it
+def day25_items ():  return load_literal("day25.py", "all_items")
+
+def day13_game (program, engine):
+    # The whole game, keeping the paddle under the ball - the Computer, and the final score
+    program[0] = 2  # Free play
+    position = { 3 : 0, 4 : 0 }  # paddle and ball x
+    c = Computer(program, input_fun=lambda: (position[4] > position[3]) - (position[4] < position[3]), engine=engine)
+    score = None
+    while True:
+        triad = c.run_until(n_outputs=3)
+        if c.halted:
+            if triad:
+                raise ValueError("Game ended part way through a tile: {}".format(triad))
+            return c, score
+        x, y, tile = triad
+        if x == -1: score = tile
+        elif tile in position: position[tile] = x
+
+def day23_network (program, engine):
+    # The network, until the NAT sends the same y twice in a row - the Computers, and that y
+    computers = [Computer(list(program), inputs=[i], engine=engine) for i in range(50)]
+    network = Network(computers, packet_size=3, empty_input=-1)
+    nat, last_y = None, None
+    while True:
+        if network.run():
+            _, nat = network.outbox.popleft()
+        else:
+            if nat[1] == last_y: break
+            last_y = nat[1]
+            network.send(0, nat)
+    return computers, last_y
@@ -0,0 +1,264 @@
+# Times the puzzle programs' real workloads, and compares the times with a baseline
+#   python bench/suite.py [workload...] [--engine fast] [--warmup 1] [--repeat 7] [--json results.json]
+#                         [--baseline bench/baseline.json|none] [--threshold 0.3] [--confirm 2]
+# Each workload runs in its own process (so its peak RSS is its own): warmup runs (at least one,
+# which is timed to see how many runs make up MIN_SAMPLE seconds), then repeat timed samples of
+# that many runs each - the times are per run.  The engines that don't count the instructions
+# they run (see COUNTING_ENGINES) then get one more run with the classic engine, to count them
+# for instructions/second.
+#
+# The machine's speed wanders (a lot, on a shared one), so each sample is timed between two runs
+# of calibrate(), and what's compared with the baseline is the median of the samples' times
+# relative to those.  Even measured like that, the same code varies by as much as 20-25% from
+# one process to the next, hence the threshold of 30%.  A workload that's more than threshold
+# slower than the baseline is measured again, up to confirm more times (each in a new process),
+# and only flagged as a regression if it's slower every time - its fastest run is the one kept.
+# A workload whose answer has changed is always flagged.  Anything flagged makes the exit
+# status 1.
+# With no --baseline the default is baseline.json here, if there is one.  To make a new one:
+#   python bench/suite.py --json bench/baseline.json
+import argparse, itertools, json, math, os, platform, re, statistics, subprocess, sys, time
+import programs
+from computer import COUNTING_ENGINES, ENGINES, Computer, ProgramImage
+try:
+    import resource
+except ImportError:
+    resource = None  # Not on Windows - no peak RSS
+
+BASELINE = os.path.join(programs.HERE, "baseline.json")
+MIN_SAMPLE = 0.5  # Seconds
+
+_loaded = {}
+def load (name):
+    # A copy of one of the programs (see programs.py) - only read once, so it isn't timed
+    if name not in _loaded:
+        _loaded[name] = getattr(programs, name)()
+    return list(_loaded[name])
+
+def day9 (engine):
+    # BOOST - the self-test, then sensor boost mode
+    outputs, steps = [], 0
+    for mode in (1, 2):
+        c = Computer(load("day9"), inputs=[mode], engine=engine)
+        outputs += c.run()
+        steps += c.steps
+    return outputs, steps
+
+def day13 (engine):
+    # The whole game (see programs.py) - the final score
+    c, score = programs.day13_game(load("day13"), engine)
+    return score, c.steps
+
+MOVES = { 1 : (0, -1), 2 : (0, 1), 3 : (-1, 0), 4 : (1, 0) }  # north, south, west, east
+BACK = { 1 : 2, 2 : 1, 3 : 4, 4 : 3 }
+
+def day15 (engine):
+    # Explore the whole map depth first, going back after each dead end - the oxygen system's
+    # position and the number of open squares
+    droid = Computer(load("day15"), pause_on_output=True, engine=engine)
+    def move(direction):
+        droid.inputs.append(direction)
+        return droid.run()[0]
+
+    seen = {(0, 0)}
+    oxygen = None
+    stack = [((0, 0), [1, 2, 3, 4], None)]  # position, directions still to try, how we got there
+    while stack:
+        (x, y), directions, came = stack[-1]
+        if not directions:
+            stack.pop()
+            if came is not None:
+                move(BACK[came])
+            continue
+        direction = directions.pop()
+        dx, dy = MOVES[direction]
+        there = (x+dx, y+dy)
+        if there in seen:
+            continue
+        seen.add(there)
+        status = move(direction)
+        if status:
+            if status == 2:
+                oxygen = there
+            stack.append((there, [1, 2, 3, 4], direction))
+    return [oxygen, len(seen)], droid.steps
+
+def day19 (engine):
+    # Every probe of the 50x50 scan, resetting one Computer - the number of points in the beam
+    c = Computer(ProgramImage(load("day19")), engine=engine)
+    points = steps = 0
+    for y in range(50):
+        for x in range(50):
+            c.reset(inputs=[x, y])
+            points += c.run()[0]
+            steps += c.steps
+    return points, steps
+
+def day23 (engine):
+    # The network (see programs.py) - the y the NAT sends twice in a row
+    computers, last_y = programs.day23_network(load("day23"), engine)
+    return last_y, sum(c.steps for c in computers)
+
+def day25 (engine):
+    # Pick up the items and go to the checkpoint (as day25.py does), then try each combination
+    # of them on the pressure-sensitive floor, going back to a snapshot at the checkpoint each
+    # time - the password
+    droid = Computer(load("day25"), engine=engine, pause_on_input=True)
+    route, items = load("day25_route"), load("day25_items")
+    droid.feed("".join(command + "\n" for command in route))
+    droid.feed("".join("drop {}\n".format(item) for item in items))
+    droid.run_until(input_needed=True)
+    checkpoint = droid.snapshot()
+    steps = droid.steps
+    for n in range(len(items) + 1):
+        for combination in itertools.combinations(items, n):
+            droid.restore(checkpoint)
+            droid.feed("".join("take {}\n".format(item) for item in combination) + "south\n")
+            out = "".join(map(chr, droid.run_until(input_needed=True)))
+            steps += droid.steps - checkpoint.steps
+            if droid.halted:
+                return int(re.findall(r"\d+", out)[-1]), steps
+
+WORKLOADS = { "day9" : day9, "day13" : day13, "day15" : day15, "day19" : day19, "day23" : day23, "day25" : day25 }
+
+def calibrate ():
+    # A fixed amount of plain Python work, timed alongside each sample to see how fast the machine
+    # is being right then
+    counts = {}
+    for i in range(200000):
+        counts[i & 1023] = counts.get(i & 1023, 0) + i
+    return counts
+
+def peak_rss ():
+    # Bytes, or None if we can't tell
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # Linux reports KiB
+
+def measure (name, engine, warmup, repeat):
+    # Runs in the workload's own process - see main
+    run = WORKLOADS[name]
+    for _ in range(warmup - 1):
+        run(engine)
+    start = time.perf_counter()
+    run(engine)
+    loops = max(1, math.ceil(MIN_SAMPLE / (time.perf_counter() - start)))
+    times, relative = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        calibrate()
+        calibration = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(loops):
+            result, steps = run(engine)
+        times.append((time.perf_counter() - start) / loops)
+        start = time.perf_counter()
+        calibrate()
+        calibration = (calibration + time.perf_counter() - start) / 2
+        relative.append(times[-1] / calibration)
+    rss = peak_rss()  # Before counting with the classic engine, which may well use more
+    if engine not in COUNTING_ENGINES:
+        _, steps = run("classic")
+    median = statistics.median(times)
+    return { "result" : result, "steps" : steps, "warmup" : warmup, "loops" : loops, "times" : times,
+             "best" : min(times), "median" : median, "instructions_per_second" : steps / median,
+             "peak_rss" : rss, "relative" : statistics.median(relative), "runs" : 1 }
+
+def measure_elsewhere (name, engine, warmup, repeat):
+    # measure() in a new process
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", name, engine, str(warmup), str(repeat)],
+                         stdout=subprocess.PIPE, check=True, cwd=programs.PYTHON_DIR).stdout
+    return json.loads(out)
+
+def change (result, base):
+    # How much slower than the baseline (as a fraction - negative if it's faster)
+    return result["relative"] / base["relative"] - 1
+
+def compare (results, baseline, threshold):
+    # Lines saying how each workload compares with the baseline, and whether any regressed
+    lines, regressed = [], False
+    same_engine = baseline["engine"] == results["engine"]
+    if not same_engine:
+        lines.append("Baseline is for the {} engine, not {} - only comparing answers".format(baseline["engine"], results["engine"]))
+    for name, result in results["workloads"].items():
+        base = baseline["workloads"].get(name)
+        if base is None:
+            continue
+        flags = []
+        if change(result, base) > threshold and same_engine:
+            flags.append("REGRESSION (slower in all {} runs)".format(result["runs"]))
+        if result["result"] != base["result"]:
+            flags.append("DIFFERENT ANSWER (was {})".format(base["result"]))
+        regressed = regressed or bool(flags)
+        lines.append("  {:6} {:8.3f}s  baseline {:8.3f}s  {:+7.1%} relative to the machine  {}".format(
+            name, result["median"], base["median"], change(result, base), " ".join(flags)))
+    return lines, regressed
+
+def main (args):
+    if args[:1] == ["--measure"]:
+        # One workload, in its own process - results as JSON on stdout
+        name, engine, warmup, repeat = args[1], args[2], int(args[3]), int(args[4])
+        json.dump(measure(name, engine, warmup, repeat), sys.stdout)
+        return 0
+
+    parser = argparse.ArgumentParser(prog="bench/suite.py", description="Times the puzzle programs' workloads, "
+                                     "and compares the times with a baseline")
+    parser.add_argument("workloads", nargs="*", metavar="workload",
+                        help="any of {} (default all)".format(", ".join(WORKLOADS)))
+    parser.add_argument("--engine", default="fast", choices=ENGINES)
+    parser.add_argument("--warmup", type=int, default=1, help="runs before timing (at least 1)")
+    parser.add_argument("--repeat", type=int, default=7, help="timed samples")
+    parser.add_argument("--json", help="where to write the results")
+    parser.add_argument("--baseline", default=BASELINE if os.path.exists(BASELINE) else "none",
+                        help="results to compare with, or none")
+    parser.add_argument("--threshold", type=float, default=0.3, help="how much slower is a regression")
+    parser.add_argument("--confirm", type=int, default=2, help="how many more times to measure a regression")
+    options = parser.parse_args(args)
+    unknown = [name for name in options.workloads if name not in WORKLOADS]
+    if unknown:
+        parser.error("unknown workload: {}".format(", ".join(unknown)))
+    names = options.workloads or list(WORKLOADS)
+    engine = options.engine
+    warmup = max(1, options.warmup)
+    repeat = options.repeat
+    threshold = options.threshold
+    confirm = options.confirm
+    baseline_path = None if options.baseline == "none" else options.baseline
+    json_path = options.json
+
+    baseline = None
+    if baseline_path and os.path.abspath(baseline_path) != os.path.abspath(json_path or ""):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    results = { "engine" : engine, "python" : platform.python_version(), "machine" : platform.machine(),
+                "workloads" : {} }
+    print("{} engine, Python {}, {} warmup runs and {} timed samples each".format(engine, results["python"], warmup, repeat))
+    for name in names:
+        result = latest = measure_elsewhere(name, engine, warmup, repeat)
+        base = baseline and baseline["engine"] == engine and baseline["workloads"].get(name)
+        while base and change(result, base) > threshold and result["runs"] <= confirm:
+            # Could just be the machine - it's only a regression if it's slower every time
+            print("  {:6} {:+.1%} - measuring again".format(name, change(latest, base)))
+            latest = measure_elsewhere(name, engine, warmup, repeat)
+            latest["runs"] = result["runs"] + 1
+            result = latest if latest["relative"] < result["relative"] else dict(result, runs=latest["runs"])
+        results["workloads"][name] = result
+        rss = "{:6.1f} MiB".format(result["peak_rss"] / 2**20) if result["peak_rss"] else "?"
+        print("  {:6} {:8.3f}s best {:8.3f}s median {:12,.0f} instructions/s  peak RSS {}  -> {}".format(
+            name, result["best"], result["median"], result["instructions_per_second"], rss, result["result"]))
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if baseline is not None:
+        lines, regressed = compare(results, baseline, threshold)
+        print("Compared with {} (threshold {:.0%}):".format(baseline_path, threshold))
+        print("\n".join(lines))
+        return 1 if regressed else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,3 +1,17 @@
+from array import array
+import contextlib
+from collections import Counter, OrderedDict, deque, namedtuple
+import hashlib
+import io
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+# asyncio, mmap, multiprocessing, sqlite3 and numpy are only imported by the things that use
+# them, so the day scripts don't wait for them
+
 DEBUG=False
 
 def massert (cond, *args):
@@ -8,51 +22,38 @@ def massert (cond, *args):
         assert(False)
 
 class Instruction:
+    # Instructions are decoded once per address and cached by the Computer, so an instance must
+    # not hold any state from a particular execution - only the opcode and the parameter modes.
     @staticmethod
     def get_instruction (instruction):
         # Factory
         opcode = instruction %100
         modes = instruction // 100
 
-        if DEBUG: print("{} ({} | {})".format(instruction, opcode, modes),)
-
-        return { 1 : AddInstr,
-                 2 : MultInstr,
-                 3 : InputInstr,
-                 4 : OutputInstr,
-                 5 : JitInstr,
-                 6 : JifInstr,
-                 7 : LtInstr,
-                 8 : EqInstr,
-                 9 : RelBaseInstr,
-                99 : TerminateInstr }[opcode](modes)
+        return OPCODES[opcode](modes)
 
     def __init__ (self, modes):
-        self.modes = modes
-
-        self._params = None
-
-        if DEBUG: print(self.__class__.__name__)
+        self.modes = self._decode_modes(modes)
 
     def get_params (self, computer):
-        if self._params is None:
-            self._decode_modes()
-            self._params = self._get_params(computer)
-
-        return self._params
+        return self._get_params(computer)
 
     def _get_params (self, computer):
         # override in child class
         assert(False)
 
-    def _get_single_param (self, computer, ip):
+    def _get_single_param (self, computer, ip, n):
+        # n is the index of the parameter - picks out the mode to use
         p = computer.get(ip)
-        return self._maybe_deref(p, computer)
+        return self._maybe_deref(p, computer, self.modes[n])
 
-    def _maybe_deref (self, param, computer):
-        # Only works if params are called in order!
-        m = self.modes.pop(0) if self.modes else 0
+    def _get_write_param (self, computer, ip, n):
+        # Parameters that are written to are never immediate - just need the relative base
+        p = computer.get(ip)
+        if self.modes[n] == 2: p = p + computer.relative_base
+        return p
 
+    def _maybe_deref (self, param, computer, m):
         if m == 0:
             # position mode
             return computer.get(param)
@@ -71,13 +72,15 @@ class Instruction:
         # returns (new ip, continue)
         assert(False)
 
-    def _decode_modes (self):
+    @staticmethod
+    def _decode_modes (modes):
+        # 3 parameters is the most any instruction takes; missing modes are 0
         modesarr = []
-        while self.modes > 0:
-            modesarr.append(self.modes % 10)
-            self.modes //= 10
+        while len(modesarr) < 3:
+            modesarr.append(modes % 10)
+            modes //= 10
 
-        self.modes = modesarr
+        return tuple(modesarr)
 
 class CombineTwoInstr(Instruction):
     # Use default init method
@@ -96,12 +99,9 @@ class CombineTwoInstr(Instruction):
     def _get_params (self, computer):
         # Add or multiply - process 2 params and store at 3rd
         # Three parameters, starting from the next position after the ip
-        p1 = self._get_single_param(computer, computer.ip+1)
-        p2 = self._get_single_param(computer, computer.ip+2)
-
-        p3 = computer.get(computer.ip+3)
-        m = self.modes.pop(0) if self.modes else 0
-        if m == 2: p3 = p3 + computer.relative_base
+        p1 = self._get_single_param(computer, computer.ip+1, 0)
+        p2 = self._get_single_param(computer, computer.ip+2, 1)
+        p3 = self._get_write_param(computer, computer.ip+3, 2)
 
         return (p1, p2, p3)
 
@@ -122,13 +122,10 @@ class MultInstr(CombineTwoInstr):
 class InputInstr(Instruction):
 
     def execute (self, computer):
-        #assert(len(self.modes) == 1)
-        mode = self.modes
+        mode = self.modes[0]
 
         val = computer.get_input()
 
-        if DEBUG: print("mode:", mode, " val:", val)
-
         if mode == 0 or mode == 1:
             # Store the val at the address stored in the param
             loc = computer.get(computer.ip +1)
@@ -150,7 +147,7 @@ class OutputInstr(Instruction):
         return computer.ip+2, True
 
     def _get_params(self, computer):
-        p = self._get_single_param(computer, computer.ip+1)
+        p = self._get_single_param(computer, computer.ip+1, 0)
         return (p, )
 
 class TerminateInstr(Instruction):
@@ -170,13 +167,12 @@ class JumpIfInstr(Instruction):
         else:
             next_ip = computer.ip +3  # Opcode, test val, next ip val
 
-        if DEBUG: print(self.__class__.__name__, test_val, ip_val, "->", next_ip)
         return next_ip, True
 
     def _get_params (self, computer):
         ip = computer.ip
 
-        return (self._get_single_param(computer, ip+1), self._get_single_param(computer, ip+2))
+        return (self._get_single_param(computer, ip+1, 0), self._get_single_param(computer, ip+2, 1))
 
 class JitInstr(JumpIfInstr):
     # Jump if true.  If first param is non-zero, set ip to value from second param
@@ -202,12 +198,9 @@ class CompareInstr(Instruction):
         return computer.ip+4, True  # instruction, 2 params to compare, 1 store
 
     def _get_params (self, computer):
-        p1 = self._get_single_param(computer, computer.ip+1)
-        p2 = self._get_single_param(computer, computer.ip+2)
-
-        p3 = computer.get(computer.ip+3)
-        m = self.modes.pop(0) if self.modes else 0
-        if m == 2: p3 = p3 + computer.relative_base
+        p1 = self._get_single_param(computer, computer.ip+1, 0)
+        p2 = self._get_single_param(computer, computer.ip+2, 1)
+        p3 = self._get_write_param(computer, computer.ip+3, 2)
 
         return (p1, p2, p3)
 
@@ -226,11 +219,10 @@ class EqInstr(CompareInstr):
 class RelBaseInstr(Instruction):
     def execute (self, computer):
         computer.relative_base += self.get_params(computer)[0]
-        if DEBUG: print("Relbase is now", computer.relative_base)
         return computer.ip+2, True
 
     def _get_params (self, computer):
-        p1 = self._get_single_param(computer, computer.ip+1)
+        p1 = self._get_single_param(computer, computer.ip+1, 0)
         return (p1, )
 
 class TemplateInstr(Instruction):
@@ -243,76 +235,806 @@ class TemplateInstr(Instruction):
         # TODO figure out what params you need
         return (p1, p2, )
 
+OPCODES = { 1 : AddInstr,
+            2 : MultInstr,
+            3 : InputInstr,
+            4 : OutputInstr,
+            5 : JitInstr,
+            6 : JifInstr,
+            7 : LtInstr,
+            8 : EqInstr,
+            9 : RelBaseInstr,
+           99 : TerminateInstr }
+
+def _uses_relative_base (op):
+    # Whether the instruction word needs the relative base - see relative_mode in Computer
+    return op % 100 == 9 or 2 in Instruction._decode_modes(op // 100)
+
+# Fast engine
+# Rather than an Instruction object per step, every possible instruction word (opcode plus
+# parameter modes) gets its own small function, generated from the templates below, and the
+# functions are looked up in a tuple indexed by the instruction word.  Each function takes
+# (memory, ip, relative_base) and returns the next ip.  Input, output, relative base and halt
+# change the state of the Computer itself, so they're handled inline in Computer._run_fast.
+def _param_src (mode, n):
+    # Source for reading parameter n (1-based) of the instruction at ip
+    if mode == 0:
+        return "mem[mem[ip+{}]]".format(n)
+    elif mode == 1:
+        return "mem[ip+{}]".format(n)
+    else:
+        return "mem[rb+mem[ip+{}]]".format(n)
+
+def _dest_src (mode, n):
+    # Source for the address written by parameter n
+    if mode == 2:
+        return "rb+mem[ip+{}]".format(n)
+    else:
+        return "mem[ip+{}]".format(n)
+
+# Instructions that write {p1} op {p2} to the address in the 3rd parameter
+WRITE_TEMPLATES = { 1 : "{p1} + {p2}",
+                    2 : "{p1} * {p2}",
+                    7 : "1 if {p1} < {p2} else 0",
+                    8 : "1 if {p1} == {p2} else 0" }
+
+# Instructions that pick the next ip
+JUMP_TEMPLATES = { 5 : "{p2} if {p1} else {next}",
+                   6 : "{next} if {p1} else {p2}" }
+
+def _all_modes ():
+    # Every (instruction word, modes) combination for each opcode
+    for modes in range(1000):
+        decoded = Instruction._decode_modes(modes)
+        if max(decoded) <= 2:
+            yield modes * 100, decoded
+
+# Superinstructions
+# The puzzle programs come out of a compiler, so a few pairs of instructions turn up over and over:
+#   compare, then jump on the result      1007 a b c, 1005 c target
+#   push a return address, then call      21101 ret 0 0, 1105 1 target
+#   drop the stack frame, then return     109 -n, 2106 0 0
+# The fast engine's handler for the first of a pair looks at the instruction after it and, if
+# it's the second, runs that too, saving a trip round the dispatch loop (109 is run inline by the
+# loop, which does the same).  The next instruction is checked every time, after the first one's
+# write, so self-modifying code that changes either of them just stops them being fused.
+# FUSED maps the first instruction word to the second words it's fused with, and whether the
+# jump has to test the address the first one wrote to (or, for a return, jump through [rb+0]).
+FUSED = { 21101 : ((1105, 1106), False), 21102 : ((1105, 1106), False), 109 : ((2106,), True) }
+for _base, _modes in _all_modes():
+    if _modes[2] != 1:
+        for _code in (7, 8):
+            FUSED[_base + _code] = ((1005 + 100 * _modes[2], 1006 + 100 * _modes[2]), True)
+
+def fused_with_next (mem, ip):
+    # Whether the fast engine would run the instruction at ip together with the next one
+    op = mem[ip]
+    if op not in FUSED: return False
+    seconds, shared = FUSED[op]
+    n = ip + (2 if op == 109 else 4)
+    if n + 2 >= len(mem) or mem[n] not in seconds: return False
+    if not shared: return True
+    return mem[n+1] == (0 if op == 109 else mem[ip+3])
+
+DIRTY_BITS = 6  # Memory is marked dirty in 64 word chunks - see Memory below
+
+def _build_handlers (barrier=False):
+    # With barrier=True, writes also mark the dirty map (see Computer.reset) and check the codemap
+    # (see the JIT engine), and the handlers take (memory, ip, relative_base, dirty, codemap, invalidate)
+    handlers = [None] * 22300  # Big enough for any valid instruction word (22208 is the largest)
+    args = "mem, ip, rb, dirty, codemap, invalidate" if barrier else "mem, ip, rb"
+    source = []
+    for base, (m1, m2, m3) in _all_modes():
+        for opcode, template in WRITE_TEMPLATES.items():
+            value = template.format(p1=_param_src(m1, 1), p2=_param_src(m2, 2))
+            if barrier:
+                body = ("    d = {}\n    mem[d] = {}\n    dirty[d >> {}] = 1\n"
+                        "    if codemap[d]: invalidate(d)\n").format(_dest_src(m3, 3), value, DIRTY_BITS)
+            elif base + opcode in FUSED:
+                # See Superinstructions - the try costs nothing unless the next words are past the end
+                (j5, j6), shared = FUSED[base + opcode]
+                if shared:
+                    # Jump on the value just written, if the jump reads it back from the same address
+                    dest, jump_reads = _dest_src(m3, 3), _dest_src(m3, 5)
+                    body = "    d = {}\n    mem[d] = v = {}\n".format(dest, value)
+                    test = "v"
+                    matches = " and {} == d".format(jump_reads)
+                else:
+                    body = "    mem[{}] = {}\n".format(_dest_src(m3, 3), value)
+                    test, matches = "mem[ip+5]", ""
+                body += ("    try:\n"
+                         "        n = mem[ip+4]\n"
+                         "        if n == {j5}{matches}: return mem[ip+6] if {test} else ip+7\n"
+                         "        if n == {j6}{matches}: return ip+7 if {test} else mem[ip+6]\n"
+                         "    except IndexError: pass\n").format(j5=j5, j6=j6, matches=matches, test=test)
+            else:
+                body = "    mem[{}] = {}\n".format(_dest_src(m3, 3), value)
+            source.append("def op_{}({}):\n{}    return ip+4\n".format(base + opcode, args, body))
+
+        for opcode, template in JUMP_TEMPLATES.items():
+            value = template.format(p1=_param_src(m1, 1), p2=_param_src(m2, 2), next="ip+3")
+            source.append("def op_{}({}):\n    return {}\n".format(base + opcode, args, value))
+
+    namespace = {}
+    exec(compile("\n".join(source), "<intcode fast handlers>", "exec"), namespace)
+    for name, fun in namespace.items():
+        if name.startswith("op_"):
+            handlers[int(name[3:])] = fun
+
+    return tuple(handlers)
+
+_HANDLERS = {}
+def _handlers (barrier=False):
+    # The handlers for the fast engine (or with barrier=True, the JIT engine) - built the first
+    # time one of them runs
+    if barrier not in _HANDLERS:
+        _HANDLERS[barrier] = _build_handlers(barrier)
+    return _HANDLERS[barrier]
+
+_WITHOUT_RELATIVE_BASE = {}
+def _without_relative_base (handlers):
+    # The handlers for a Computer without relative_mode - anything using it drops through to the
+    # engine's own checks
+    if id(handlers) not in _WITHOUT_RELATIVE_BASE:
+        _WITHOUT_RELATIVE_BASE[id(handlers)] = tuple(None if handler is None or _uses_relative_base(op) else handler
+                                                     for op, handler in enumerate(handlers))
+    return _WITHOUT_RELATIVE_BASE[id(handlers)]
+
+# JIT engine
+# Runs like the fast engine, but counts how often each block (a straight run of instructions
+# ending in a jump, or just before an input, output or halt) is entered.  Once a block has been
+# entered JIT_THRESHOLD times it's translated into the source for a single Python function,
+# compiled, and from then on the compiled version is run instead.  The compiled code has the
+# block's parameters baked into it, so every write (compiled or not) checks the codemap, which
+# is 1 for addresses that belong to a compiled block, and throws away any block it overwrites.
+# A block that keeps being overwritten is left to the interpreter after JIT_MAX_COMPILES.
+JIT_THRESHOLD = 50
+JIT_MAX_BLOCK = 100  # Instructions
+JIT_MAX_COMPILES = 3
+
+class JitFault(IndexError):
+    # Raised by compiled blocks that touch memory past the end of the list (or overflow compact
+    # memory), so the engine knows which instruction to retry (args are ip, relative_base)
+    pass
+
+def _jit_param_src (mode, val):
+    if mode == 0:
+        return "mem[{}]".format(val)
+    elif mode == 1:
+        return "({})".format(val)
+    else:
+        return "mem[rb+({})]".format(val)
+
+class BlockCache:
+    def __init__ (self, size, dirty, image=None, relative_mode=True):
+        self.blocks = {}  # entry ip -> compiled function
+        self.ranges = {}  # entry ip -> (first address, last address+1) the block was compiled from
+        self.counts = {}  # entry ip -> number of times the block has been entered
+        self.compiles = {}  # entry ip -> number of times the block has been compiled
+        self.codemap = bytearray(size)
+        self.dirty = dirty  # The Computer's, for compiled code to mark
+        self.image = image
+        self.relative_mode = relative_mode  # The Computer's - blocks stop at anything that needs it
+        self.modified = set()  # entry ips of blocks compiled from code that doesn't match the image
+
+    def resize (self, size):
+        # The codemap must be as long as memory, so compiled code can index it with any address
+        # that it was able to write to
+        if size > len(self.codemap):
+            self.codemap.extend(bytes(size - len(self.codemap)))
+
+    def written (self, loc):
+        if loc < len(self.codemap) and self.codemap[loc]:
+            self.invalidate(loc)
+
+    def invalidate (self, loc):
+        # Self-modifying code - forget every block that includes loc
+        loc %= len(self.codemap)
+        self.invalidate_range(loc, loc+1)
+
+    def invalidate_range (self, first, last):
+        # Forget every block that includes any address from first up to (not including) last
+        for entry, (start, end) in list(self.ranges.items()):
+            if start < last and first < end:
+                if DEBUG: print("Invalidating block", entry, "after write to", first, "-", last)
+                del self.blocks[entry]
+                del self.ranges[entry]
+                if self.compiles[entry] < JIT_MAX_COMPILES:
+                    self.counts[entry] = 0
+
+        # Blocks can overlap, so rebuild the map from what's left
+        self.codemap[:] = bytes(len(self.codemap))
+        for start, end in self.ranges.values():
+            self.codemap[start:end] = b"\x01" * (end - start)
+
+    def forget_modified (self):
+        # Memory is going back to the program image (see Computer.reset)
+        for entry in self.modified:
+            if entry in self.ranges:
+                self.invalidate_range(*self.ranges[entry])
+        self.modified = set()
+
+    def compile (self, mem, entry):
+        # Returns the compiled block, or None if there's nothing at entry worth compiling
+        lines = []
+        ip = entry
+        ended = False
+        while len(lines) < JIT_MAX_BLOCK and not ended and 0 <= ip and ip+3 < len(mem):
+            op = mem[ip]
+            opcode, (m1, m2, m3) = op % 100, Instruction._decode_modes(op // 100)
+            if op < 0 or max(m1, m2, m3) > 2: break
+            if not self.relative_mode and _uses_relative_base(op): break
+            p1 = _jit_param_src(m1, mem[ip+1])
+            p2 = _jit_param_src(m2, mem[ip+2])
+
+            if opcode in WRITE_TEMPLATES:
+                d = "rb+({})".format(mem[ip+3]) if m3 == 2 else str(mem[ip+3])
+                value = WRITE_TEMPLATES[opcode].format(p1=p1, p2=p2)
+                lines.append("    d = {d}\n"
+                             "    try: mem[d] = {value}\n"
+                             "    except (IndexError, OverflowError): raise JitFault({ip}, rb)\n"
+                             "    dirty[d >> {bits}] = 1\n"
+                             "    if codemap[d]:\n"
+                             "        invalidate(d)\n"
+                             "        return {next}, rb\n".format(d=d, value=value, ip=ip, next=ip+4, bits=DIRTY_BITS))
+                ip += 4
+            elif opcode in JUMP_TEMPLATES:
+                value = JUMP_TEMPLATES[opcode].format(p1=p1, p2=p2, next=ip+3)
+                lines.append("    try: return {}, rb\n"
+                             "    except (IndexError, OverflowError): raise JitFault({}, rb)\n".format(value, ip))
+                ip += 3
+                ended = True
+            elif opcode == 9:
+                lines.append("    try: rb += {}\n"
+                             "    except (IndexError, OverflowError): raise JitFault({}, rb)\n".format(p1, ip))
+                ip += 2
+            else:
+                # Input, output, halt (or something that isn't code) - leave to the interpreter
+                break
+
+        if not lines:
+            return None
+        if not ended:
+            lines.append("    return {}, rb\n".format(ip))
+
+        source = "def block_{}(mem, rb, dirty=dirty, codemap=codemap, invalidate=invalidate):\n{}".format(entry, "".join(lines))
+        if DEBUG: print(source)
+        namespace = {"dirty" : self.dirty, "codemap" : self.codemap, "invalidate" : self.invalidate, "JitFault" : JitFault}
+        exec(compile(source, "<intcode block {}>".format(entry), "exec"), namespace)
+
+        self.blocks[entry] = namespace["block_{}".format(entry)]
+        self.ranges[entry] = (entry, ip)
+        self.compiles[entry] = self.compiles.get(entry, 0) + 1
+        if self.image is not None and any(mem[loc] != self.image.get(loc) for loc in range(entry, ip)):
+            self.modified.add(entry)
+        self.codemap[entry:ip] = b"\x01" * (ip - entry)
+        return self.blocks[entry]
+
+# Memory
+# The program image (plus anything written just past the end of it) lives in one dense list,
+# which is what the engines index directly.  Writes to addresses far beyond that go into a dict
+# of PAGE_SIZE pages instead, so a program that uses a high address doesn't allocate every cell
+# below it.  Reads of cells that were never written are 0, without allocating anything.
+#
+# With compact=True the memory and pages are array('q') rather than lists, which stores 8 bytes
+# per cell instead of a pointer to a separately allocated int.  The first value that doesn't fit
+# in 64 bits switches that Computer back to lists.
+#
+# fork() and snapshot() share memory copy-on-write: the dense list is copied by whichever
+# Computer writes to it first (unless it's the last one still using it), and pages are copied
+# one at a time as they're written.
+#
+# The classic and JIT engines also mark which DIRTY_BITS sized chunks of the dense memory have
+# been written to, so that reset() only has to put those back.  Marking every write slows the
+# fast engine's handlers down by more than copying the whole image costs, so it doesn't.
+PAGE_SIZE = 1024
+DIRTY_ENGINES = ("classic", "jit")
+
+# Image files
+# ProgramImage.save writes a program as a header, then every word as a little-endian int64, then
+# the words that don't fit in 64 bits:
+#   header      IMAGE_MAGIC, then the format version, number of words and number of big words
+#               (each a little-endian uint64)
+#   words       one int64 each - a big word's is BIG_WORD (which is never used as itself)
+#   big words   for each, its address and length in bytes (uint64s), then its value as that many
+#               bytes of signed little-endian
+# ProgramImage.load maps the file into memory and uses the words where they are, so there's
+# nothing to parse - a Computer copies them into its own memory as it starts (with a single
+# memcpy, if it's compact).  Making the image from a list of words:  ProgramImage(words).save(path)
+IMAGE_MAGIC = b"INTCODE\0"
+IMAGE_VERSION = 1
+IMAGE_HEADER = struct.Struct("<8sQQQ")
+BIG_WORD_HEADER = struct.Struct("<QQ")
+BIG_WORD = -2**63
+
+class ProgramImage:
+    # A program's initial memory, which never changes.  Computers made from one can be reset()
+    # to the start of the program again, keeping their decoded instructions and compiled blocks.
+    def __init__ (self, words):
+        # A memoryview of int64s is used as it is (see load), anything else is copied
+        self.words = words if isinstance(words, memoryview) else tuple(words)
+        self._chunks = {}  # compact -> the image in chunks (the last one padded with 0s), then a chunk of 0s
+        self._digest = None
+        self.path = None  # The image file it was loaded from, if it was
+
+    def __len__ (self):
+        return len(self.words)
+
+    def __iter__ (self):
+        return iter(self.words)
+
+    def __getitem__ (self, ix):
+        return self.words[ix]
+
+    def digest (self):
+        # A hash of the program, which identifies it in a RunCache
+        if self._digest is None:
+            self._digest = hashlib.sha256(",".join(map(str, self.words)).encode()).hexdigest()
+        return self._digest
+
+    def get (self, loc):
+        # Like Computer.get - 0 past the end
+        return self.words[loc] if 0 <= loc < len(self.words) else 0
+
+    def copy (self, compact=False):
+        # The words as a new list - or array('q') if compact, and they all fit in 64 bits
+        if compact:
+            try:
+                if isinstance(self.words, memoryview):
+                    memory = array('q')
+                    memory.frombytes(self.words.cast("B"))
+                    return memory
+                return array('q', self.words)
+            except OverflowError:
+                pass
+        return list(self.words)
+
+    def save (self, path):
+        # See Image files
+        fits = lambda word: BIG_WORD < word < -BIG_WORD
+        big = [(loc, word) for loc, word in enumerate(self.words) if not fits(word)]
+        packed = array('q', (word if fits(word) else BIG_WORD for word in self.words))
+        if sys.byteorder != "little":
+            packed.byteswap()
+        with open(path, "wb") as f:
+            f.write(IMAGE_HEADER.pack(IMAGE_MAGIC, IMAGE_VERSION, len(self.words), len(big)))
+            f.write(packed.tobytes())
+            for loc, word in big:
+                data = word.to_bytes(word.bit_length() // 8 + 1, "little", signed=True)
+                f.write(BIG_WORD_HEADER.pack(loc, len(data)))
+                f.write(data)
+
+    @classmethod
+    def load (cls, path):
+        # See Image files
+        with open(path, "rb") as f:
+            import mmap
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, n_big = IMAGE_HEADER.unpack_from(data)
+        assert magic == IMAGE_MAGIC and version == IMAGE_VERSION, "Not an Intcode image (version {}): {}".format(IMAGE_VERSION, path)
+        start, end = IMAGE_HEADER.size, IMAGE_HEADER.size + 8 * n
+        words = memoryview(data)[start:end].cast("q")
+        if sys.byteorder != "little":
+            words = array('q', words.tobytes())
+            words.byteswap()
+        if n_big:
+            words = list(words)
+            for _ in range(n_big):
+                loc, size = BIG_WORD_HEADER.unpack_from(data, end)
+                end += BIG_WORD_HEADER.size
+                words[loc] = int.from_bytes(data[end:end+size], "little", signed=True)
+                end += size
+        image = cls(words)
+        image.path = os.path.abspath(path)
+        return image
+
+    def chunk (self, n, compact=False):
+        # The initial contents of the nth chunk of memory (see DIRTY_BITS), as a list (or array)
+        if compact not in self._chunks:
+            size = 1 << DIRTY_BITS
+            padded = list(self.words) + [0] * (-len(self.words) % size + size)
+            kind = (lambda words: array('q', words)) if compact else list
+            self._chunks[compact] = [kind(padded[start:start+size]) for start in range(0, len(padded), size)]
+        chunks = self._chunks[compact]
+        return chunks[n] if n < len(chunks) else chunks[-1]
+
+class InputWait(Exception):
+    # Raised when the input instruction has no input yet, to stop the engine.  The instruction
+    # is run again (from the start) next time.
+    pass
+
+def _pause_always (val):
+    return True
+
+# Profiling
+# The "profile" engine is the classic engine, but first records what each instruction is about to
+# do in the Computer's Profile.  The other engines don't pay anything for it.
+PARAM_USES = { 1 : "rrw", 2 : "rrw", 3 : "w", 4 : "r", 5 : "rr", 6 : "rr", 7 : "rrw", 8 : "rrw", 9 : "r", 99 : "" }
+
+class Profile:
+    def __init__ (self):
+        self.steps = 0
+        self.ip_counts = Counter()  # address -> number of instructions run from there
+        self.op_counts = Counter()  # opcode -> number run
+        self.reads = Counter()  # address -> number of times a parameter was read from there
+        self.writes = Counter()  # address -> number of times it was written to
+
+    def report (self, top=20):
+        # The counts as text, biggest first
+        def percent(count):
+            return "{:6.2f}%".format(100.0 * count / self.steps) if self.steps else ""
+        def table(title, counts, name=str):
+            lines = ["", title]
+            for key, count in counts.most_common(top):
+                lines.append("  {:>10}  {:>12}  {}".format(name(key), count, percent(count)))
+            return lines
+
+        lines = ["Steps: {}".format(self.steps)]
+        lines += table("Opcodes", self.op_counts, lambda code: OPCODES[code].__name__[:-5] if code in OPCODES else code)
+        lines += table("Addresses run", self.ip_counts)
+        lines += table("Addresses read", self.reads)
+        lines += table("Addresses written", self.writes)
+        return "\n".join(lines) + "\n"
+
+    def collapsed (self, range_size=64):
+        # Steps in the collapsed stack format that flamegraph.pl reads - each address is in a
+        # frame for its range of range_size addresses
+        lines = []
+        for ip in sorted(self.ip_counts):
+            start = ip - ip % range_size
+            lines.append("intcode;{}-{};{} {}".format(start, start + range_size - 1, ip, self.ip_counts[ip]))
+        return "\n".join(lines) + "\n"
+
+    def dump (self, path, collapsed=False, **kwargs):
+        with open(path, "w") as f:
+            f.write(self.collapsed(**kwargs) if collapsed else self.report(**kwargs))
+
+# Tracing
+# The "trace" engine is also the classic engine, printing each instruction and what it did.
+# It's used for Computers made while DEBUG is set, so none of the others need to check DEBUG.
+ENGINES = ("classic", "fast", "jit", "profile", "trace")
+DEFAULT_ENGINE = "classic"
+COUNTING_ENGINES = ("classic", "profile", "trace")  # Count the instructions they run in steps
 
 class Computer:
-    def __init__ (self, initial_memory_state, inputs=[], input_fun=None, pause_on_output=False):
+    def __init__ (self, initial_memory_state, inputs=None, input_fun=None, pause_on_output=False, engine=None, compact=False,
+                  pause_on_input=False, output_sink=None, relative_mode=True):
         # if inputs and input_fun:
         #     print("Invalid - define either inputs array or inputs function, not both")
         #     print(inputs)
         #     print(input_fun)
         #     assert(False)
-        self.memory = list(initial_memory_state)
+        self.image = initial_memory_state if isinstance(initial_memory_state, ProgramImage) else None
+        self._compact = compact  # What was asked for (see reset)
+        if self.image:
+            self.memory = self.image.copy(compact)
+        else:
+            self.memory = list(initial_memory_state)
+            if compact:
+                try:
+                    self.memory = array('q', self.memory)
+                except OverflowError:
+                    pass
+        self.compact = isinstance(self.memory, array)
+        self.pages = {}  # page number -> list of PAGE_SIZE values, for addresses beyond memory
+        self._sharers = None  # [number of Computers using memory], if it's shared with forks
+        self._shared_pages = set()  # pages that must be copied before writing to them
         self.ip = 0
-        self.inputs = inputs
+        self.inputs = inputs if inputs is not None else ()  # Copied into a deque - see feed
         self.input_fun = input_fun
         self.output_buffer = []
+        self.output_sink = output_sink  # Called with each output instead of keeping it
+        self.input_log = None  # Called with each input as it's used (see Recording)
+        massert(not (output_sink and pause_on_output), "Can't pause on output with an output_sink")
         self.new_output = False
         self.pause_on_output = pause_on_output
+        self.pause_on_input = pause_on_input  # Rather than fail when there's no input (see run)
+        self.needs_input = False
+        self.halted = False
+        self._pause_test = None  # Given each output, returns True to pause there
+        self._pausing = False
         self.relative_base = 0
+        self.steps = 0  # Instructions run, if the engine counts them (see COUNTING_ENGINES)
+        # False for the machine as it was on days 5 and 7, before the relative base: instruction 9
+        # and parameter mode 2 are errors rather than being run
+        self.relative_mode = relative_mode
+        self._decoded = {}  # address -> Instruction, so each instruction is only decoded once
+        self._modified_code = set()  # addresses decoded when they didn't match the image
+        self.engine = engine or ("trace" if DEBUG else DEFAULT_ENGINE)
+        massert(self.engine in ENGINES, "Unknown engine:", self.engine, "Choose from:", ENGINES)
+        # Which chunks of memory have been written to since the start (or the last reset)
+        tracked = self.engine == "jit" or (self.image and self.engine in DIRTY_ENGINES)
+        self._dirty = bytearray((len(self.memory) >> DIRTY_BITS) + 1) if tracked else None
+        self.profile = Profile() if self.engine == "profile" else None
+        self._blocks = BlockCache(len(self.memory), self._dirty, self.image, relative_mode) if self.engine == "jit" else None
 
     def append_to_output (self, val):
-        # Output
-        self.output_buffer.append(val)
-        if DEBUG: print("Output updated:\t", " ".join([str(o) for o in self.output_buffer]))
+        # Output - returns True if the engine should pause now (see run and run_until)
+        if self.output_sink is not None:
+            self.output_sink(val)
+        else:
+            self.output_buffer.append(val)
         self.new_output = True
+        if self._pause_test is not None and self._pause_test(val):
+            self._pausing = True
+        return self._pausing
 
     def store (self, val, loc):
-        self._check_or_extend_memory(loc)
+        if self._sharers is not None:
+            self._own_memory()
+        if loc >= len(self.memory):
+            self._make_room(loc)
 
-        self.memory[loc] = val
-        if DEBUG: print("Update ({}->{}):\t".format(loc,val), self.memory)
+        try:
+            if loc < len(self.memory):
+                self.memory[loc] = val
+                if self._dirty is not None:
+                    self._dirty[loc >> DIRTY_BITS] = 1
+            else:
+                page_num = loc // PAGE_SIZE
+                if page_num in self._shared_pages:
+                    self._shared_pages.discard(page_num)
+                    self.pages[page_num] = self.pages[page_num][:]
+                self.pages[page_num][loc % PAGE_SIZE] = val
+        except OverflowError:
+            # Too big for compact memory
+            self._widen()
+            return self.store(val, loc)
+
+        if loc in self._decoded:
+            # Self-modifying code - decode this instruction again next time it's run
+            del self._decoded[loc]
+        if self._blocks:
+            self._blocks.written(loc)
 
     def get (self, ix):
-        self._check_or_extend_memory(ix)
-        return self.memory[ix]
-
-    def _check_or_extend_memory(self, loc):
-        while loc >= len(self.memory):
-            self.memory.append(0)
+        if ix < len(self.memory):
+            return self.memory[ix]
+        page = self.pages.get(ix // PAGE_SIZE)
+        return page[ix % PAGE_SIZE] if page else 0
+
+    def _make_room(self, loc):
+        # Writes just past the end of memory grow it (to the end of loc's page), taking over any
+        # pages in the way.  Anything further out just needs its page to exist.
+        # Pages always start at or after the end of memory.
+        memory = self.memory
+        if loc < len(memory) + PAGE_SIZE:
+            end = (loc // PAGE_SIZE + 1) * PAGE_SIZE
+            memory.extend([0] * (end - len(memory)))
+            dirty = self._dirty
+            if dirty is not None:
+                dirty.extend(bytes((end >> DIRTY_BITS) + 1 - len(dirty)))
+            for page_num in [p for p in self.pages if p * PAGE_SIZE < end]:
+                start = page_num * PAGE_SIZE
+                memory[start:start+PAGE_SIZE] = self.pages.pop(page_num)
+                if dirty is not None:
+                    dirty[start >> DIRTY_BITS:(start+PAGE_SIZE) >> DIRTY_BITS] = b"\x01" * (PAGE_SIZE >> DIRTY_BITS)
+        elif loc // PAGE_SIZE not in self.pages:
+            self.pages[loc // PAGE_SIZE] = array('q', bytes(8 * PAGE_SIZE)) if self.compact else [0] * PAGE_SIZE
+
+    def _widen(self):
+        # Switch from compact memory to lists, which can hold any size of number
+        if DEBUG: print("Switching to list memory")
+        self.memory = list(self.memory)
+        self.pages = {page_num : list(page) for page_num, page in self.pages.items()}
+        self._shared_pages = set()
+        self.compact = False
+
+    def fork(self):
+        # An independent copy of this Computer in its current state, sharing memory copy-on-write
+        # so it's cheap however much memory there is.  input_fun is shared with the copy.
+        child = self.__class__.__new__(self.__class__)
+        child._take_state(self)
+        return child
+
+    def snapshot(self):
+        # A copy of the current state to restore() (or fork()) later - don't run it
+        return self.fork()
+
+    def restore(self, snapshot):
+        # Go back to the state in a snapshot (which can be restored again)
+        if snapshot is not self:
+            self._take_state(snapshot)
+
+    def save(self, path):
+        # Writes the Computer's state to path, for load() to carry on from later: memory (just the
+        # chunks that aren't as they are in its image), ip, relative base, the inputs it hasn't used
+        # yet and the outputs it hasn't returned yet.  input_fun and the other settings aren't saved.
+        massert(self.image is not None, "save() needs a Computer made from a ProgramImage")
+        data = bytearray(SAVE_MAGIC)
+        _pack_numbers(data, [SAVE_VERSION])
+        data += bytes.fromhex(self.image.digest())
+        image_path = (self.image.path or "").encode()
+        _pack_numbers(data, [len(image_path)])
+        data += image_path
+        _pack_numbers(data, [self.ip, self.relative_base, self.steps, self.halted, self.relative_mode])
+        for values in (self.inputs, self.output_buffer):
+            _pack_numbers(data, [len(values)])
+            _pack_numbers(data, values)
+        _pack_runs(data, _changed_runs(self))
+        with open(path, "wb") as f:
+            f.write(data)
+
+    @classmethod
+    def load(cls, path, image=None, **kwargs):
+        # A new Computer in the state save() wrote to path.  image is the program it was running -
+        # if it isn't given, it's loaded again from the image file it came from (see
+        # ProgramImage.load).  kwargs are for the new Computer (e.g. engine or input_fun).
+        with open(path, "rb") as f:
+            data = f.read()
+        assert data.startswith(SAVE_MAGIC), "Not a saved Intcode computer: {}".format(path)
+        (version,), pos = _unpack_numbers(data, len(SAVE_MAGIC), 1)
+        assert version == SAVE_VERSION, "Saved Intcode computer version {} (not {}): {}".format(version, SAVE_VERSION, path)
+        digest = data[pos:pos+32].hex()
+        (length,), pos = _unpack_numbers(data, pos + 32, 1)
+        image_path = data[pos:pos+length].decode()
+        pos += length
+        if image is None:
+            assert image_path, "Saved from a program that wasn't loaded from an image file - pass it as image"
+            image = ProgramImage.load(image_path)
+        assert image.digest() == digest, "Saved from a different program"
+
+        (ip, relative_base, steps, halted, relative_mode), pos = _unpack_numbers(data, pos, 5)
+        (n_inputs,), pos = _unpack_numbers(data, pos, 1)
+        inputs, pos = _unpack_numbers(data, pos, n_inputs)
+        (n_outputs,), pos = _unpack_numbers(data, pos, 1)
+        outputs, pos = _unpack_numbers(data, pos, n_outputs)
+        runs, pos = _unpack_runs(data, pos)
+
+        computer = cls(image, inputs=inputs, relative_mode=bool(relative_mode), **kwargs)
+        _restore_runs(computer, runs)
+        computer.ip = ip
+        computer.relative_base = relative_base
+        computer.steps = steps
+        computer.halted = bool(halted)
+        computer.output_buffer = outputs
+        computer.new_output = bool(outputs)
+        return computer
+
+    def reset(self, inputs=None):
+        # Go back to the start of the program, as if this was a new Computer with the same
+        # settings - but keeping any decoded instructions or compiled blocks that are still valid.
+        # Only the chunks of memory that have been written to are restored (see DIRTY_ENGINES).
+        massert(self.image is not None, "reset() needs a Computer made from a ProgramImage")
+        image = self.image
+        dirty = self._dirty
+        if dirty is None or self._sharers is not None or self.compact != self._compact:
+            # Rather than copy memory just to overwrite it, start again
+            if self._sharers is not None:
+                self._sharers[0] -= 1
+                self._sharers = None
+            self.memory = image.copy(self._compact)
+            if dirty is not None:
+                del dirty[(len(self.memory) >> DIRTY_BITS) + 1:]
+        else:
+            memory = self.memory
+            n = dirty.find(1)
+            while n != -1:
+                start = n << DIRTY_BITS
+                end = min(start + (1 << DIRTY_BITS), len(memory))
+                chunk = image.chunk(n, self._compact)
+                memory[start:end] = chunk if end - start == len(chunk) else chunk[:end-start]
+                n = dirty.find(1, n+1)
+        if dirty is not None:
+            dirty[:] = bytes(len(dirty))
+
+        # Instructions decoded (or compiled) from memory that the program had changed
+        for loc in self._modified_code:
+            self._decoded.pop(loc, None)
+        self._modified_code = set()
+        if self._blocks:
+            self._blocks.forget_modified()
+
+        self.compact = isinstance(self.memory, array)
+        self.pages = {}
+        self._shared_pages = set()
+        self.ip = 0
+        self.relative_base = 0
+        self.steps = 0
+        self.inputs = inputs if inputs is not None else ()
+        self.output_buffer = []
+        self.new_output = False
+        self.needs_input = False
+        self.halted = False
+
+    def _take_state(self, other):
+        if getattr(self, "_sharers", None) is not None:
+            # Letting go of our old memory
+            self._sharers[0] -= 1
+
+        if other._sharers is None:
+            other._sharers = [1]
+        other._sharers[0] += 1
+        other._shared_pages = set(other.pages)
+
+        self.image = other.image
+        self.memory = other.memory
+        self.pages = dict(other.pages)
+        self._sharers = other._sharers
+        self._shared_pages = set(other.pages)
+        self._compact = other._compact
+        self.compact = other.compact
+        self.ip = other.ip
+        self.relative_base = other.relative_base
+        self.steps = other.steps
+        self.relative_mode = other.relative_mode
+        self.inputs = other.inputs
+        self.input_fun = other.input_fun
+        self.output_buffer = list(other.output_buffer)
+        self.output_sink = other.output_sink
+        self.input_log = None  # A log is of one Computer's session
+        self.new_output = other.new_output
+        self.pause_on_output = other.pause_on_output
+        self.pause_on_input = other.pause_on_input
+        self.needs_input = other.needs_input
+        self.halted = other.halted
+        self._pause_test = None
+        self._pausing = False
+        self.engine = other.engine
+        self._decoded = {}
+        self._modified_code = set()
+        self._dirty = bytearray(other._dirty) if other._dirty is not None else None
+        self._blocks = BlockCache(len(self.memory), self._dirty, self.image, self.relative_mode) if self.engine == "jit" else None
+        self.profile = Profile() if self.engine == "profile" else None
+
+    def _own_memory(self):
+        # About to write - copy memory unless every other Computer sharing it already has
+        sharers = self._sharers
+        self._sharers = None
+        sharers[0] -= 1
+        if sharers[0]:
+            self.memory = self.memory[:]
+
+    @property
+    def inputs(self):
+        # A deque, so it can be appended to (or assigned any iterable) as if it was a list
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, values):
+        self._inputs = deque(values)
+
+    def feed(self, values):
+        # Add values to the inputs - strings are sent as ASCII codes
+        if isinstance(values, str):
+            values = map(ord, values)
+        self._inputs.extend(values)
 
     def get_input(self):
-        if self.inputs:
-            return self.inputs.pop(0)
+        if self._inputs:
+            val = self._inputs.popleft()
         elif self.input_fun:
-            return self.input_fun()
+            val = self.input_fun()
+        elif self.pause_on_input:
+            raise InputWait()
         else:
             assert(False), "No inputs available"
+        if self.input_log is not None:
+            self.input_log(val)
+        return val
 
     def run(self):
         # If computer is in "pause_on_output" mode, run until there is an instruction or program
         # halts, and return (output_val, halted) tuple
         # Otherwise run until halting, and return the full output (as an array of numbers)
-        if DEBUG: print("Starting prog:\t", self.memory,"\n  with inputs:\t", self.inputs)
-        carry_on = True
-        try:
-            while carry_on:
-                if DEBUG: print("ip:",self.ip,"\t",)
-                this_instr = self.get(self.ip)
-                instr = Instruction.get_instruction(this_instr)
-                self.ip, carry_on = instr.execute(self)
-
-                if carry_on and self.pause_on_output and self.new_output:
-                    # Send the output and then pause
-                    output = self.output_buffer[0]
-                    self.output_buffer = []
-                    self.new_output = False
-                    if DEBUG: print("Interim output:", output)
-                    return output, False
-        except:
-            raise
-        finally:
-            if self.output_buffer:
-                if DEBUG: print("Output:", self.output_buffer)
+        # In "pause_on_input" mode (or if input_fun raises InputWait) the program can also stop
+        # at an input instruction when there's no input, setting needs_input.  That returns
+        # (None, False), or the output since the last time run() returned.
+        paused = self._run_engine(_pause_always if self.pause_on_output else None)
+        if paused:
+            # Send the output and then pause
+            output = self.output_buffer[0]
+            self.output_buffer = []
+            self.new_output = False
+            return output, False
+
+        if self.needs_input:
+            if self.pause_on_output:
+                return None, False
+            output = self.output_buffer
+            self.output_buffer = []
+            self.new_output = False
+            return output
 
         if self.pause_on_output:
             if self.new_output:
@@ -323,12 +1045,1013 @@ class Computer:
         else:
             return self.output_buffer
 
+    def run_until(self, n_outputs=None, byte=None, input_needed=False):
+        # Run until there are n_outputs outputs, or byte is output, or (with input_needed) an
+        # input instruction has no input - or the program halts.  Returns the outputs since the
+        # last time run() or run_until() returned; check halted and needs_input to see why it
+        # stopped.  pause_on_output is ignored.
+        massert(n_outputs is None or self.output_sink is None, "An output_sink doesn't keep outputs to count")
+        if n_outputs is not None and byte is not None:
+            pause = lambda val: val == byte or len(self.output_buffer) >= n_outputs
+        elif n_outputs is not None:
+            pause = lambda val: len(self.output_buffer) >= n_outputs
+        elif byte is not None:
+            pause = lambda val: val == byte
+        else:
+            pause = None
+
+        pause_on_input = self.pause_on_input
+        self.pause_on_input = pause_on_input or input_needed
+        try:
+            self._run_engine(pause)
+        finally:
+            self.pause_on_input = pause_on_input
+
+        output = self.output_buffer
+        self.output_buffer = []
+        self.new_output = False
+        return output
+
+    def outputs(self, chunk_size=256):
+        # Generates the outputs as the program runs, until it halts (or stops for input, with
+        # pause_on_input).  The engine runs for up to chunk_size outputs at a time.
+        massert(self.output_sink is None, "Outputs are going to the output_sink")
+        while True:
+            yield from self.run_until(n_outputs=chunk_size)
+            if self.halted or self.needs_input:
+                return
+
+    def step(self, count=1):
+        # Run count instructions one at a time, whatever the engine, counting them in steps.
+        # Stops early if the program halts (returning False) or an input instruction has no input
+        # with pause_on_input (setting needs_input).  It never pauses on an output.
+        if self._sharers is not None:
+            self._own_memory()
+        self.needs_input = False
+        self._pause_test = None
+        self._pausing = False
+        use_cache = self.engine in COUNTING_ENGINES  # The others write to memory directly
+        try:
+            for _ in range(count):
+                carry_on = self._step(use_cache)
+                self.steps += 1
+                if not carry_on:
+                    self.halted = True
+                    return False
+        except InputWait:
+            self.needs_input = True
+        return True
+
+    def _run_engine(self, pause_test):
+        # Returns True if the engine paused on an output, otherwise False (having halted, or
+        # stopped for input - see needs_input)
+        if self._sharers is not None:
+            self._own_memory()
+        self.needs_input = False
+        self._pause_test = pause_test
+        self._pausing = False
+        try:
+            if getattr(self, "_run_" + self.engine)():
+                return True
+            self.halted = True
+            return False
+        except InputWait:
+            self.needs_input = True
+            return False
+
+    def _step(self, use_cache=True):
+        # Execute a single instruction.  Returns False once the program has halted
+        # The faster engines write to memory directly, so can't use the decode cache
+        instr = self._decoded.get(self.ip) if use_cache else None
+        if instr is None:
+            op = self.get(self.ip)
+            assert self.relative_mode or not _uses_relative_base(op), "No relative base for {} at {}".format(op, self.ip)
+            instr = Instruction.get_instruction(op)
+            if use_cache:
+                self._decoded[self.ip] = instr
+                if self.image is not None and self.get(self.ip) != self.image.get(self.ip):
+                    self._modified_code.add(self.ip)
+        self.ip, carry_on = instr.execute(self)
+        return carry_on
+
+    def _run_classic(self):
+        # Engines run until the program halts (return False) or pauses on an output (return True)
+        while self._step():
+            self.steps += 1
+            if self._pausing:
+                return True
+
+        self.steps += 1
+        return False
+
+    def _run_profile(self):
+        # See Profile
+        profile = self.profile
+        ip_counts, op_counts, reads, writes = profile.ip_counts, profile.op_counts, profile.reads, profile.writes
+        get = self.get
+        while True:
+            ip = self.ip
+            op = get(ip)
+            code = op % 100
+            uses = PARAM_USES.get(code, "")
+            if uses:
+                modes = Instruction._decode_modes(op // 100)
+                accesses = [(get(ip+1+n) + (self.relative_base if modes[n] == 2 else 0), use)
+                            for n, use in enumerate(uses) if modes[n] != 1]
+
+            carry_on = self._step()  # Nothing's recorded if this stops for input
+
+            profile.steps += 1
+            self.steps += 1
+            ip_counts[ip] += 1
+            op_counts[code] += 1
+            if uses:
+                for loc, use in accesses:
+                    (reads if use == "r" else writes)[loc] += 1
+            if not carry_on:
+                return False
+            if self._pausing:
+                return True
+
+    def _run_trace(self):
+        # See Tracing
+        print("Running from ip {} (relative base {}) with inputs {}".format(self.ip, self.relative_base, list(self.inputs)))
+        get = self.get
+        while True:
+            ip = self.ip
+            op = get(ip)
+            code = op % 100
+            uses = PARAM_USES.get(code, "")
+            modes = Instruction._decode_modes(op // 100)
+            words = [get(ip+1+n) for n in range(len(uses))]
+            where = [words[n] + (self.relative_base if modes[n] == 2 else 0) for n in range(len(uses))]
+            name = OPCODES[code].__name__[:-5] if code in OPCODES else "?"
+            instruction = "{:>6}: {:<9} {:<24}".format(ip, name, ",".join(map(str, [op] + words)))
+
+            try:
+                carry_on = self._step()
+            except InputWait:
+                print(instruction, "waiting for input")
+                raise
+            self.steps += 1
+
+            effects = ["[{}] = {}".format(where[n], get(where[n])) for n, use in enumerate(uses) if use == "w"]
+            if code == 4:
+                effects.append("output {}".format(words[0] if modes[0] == 1 else get(where[0])))
+            elif code == 9:
+                effects.append("relative base {}".format(self.relative_base))
+            elif code in JUMP_TEMPLATES and self.ip != ip+3:
+                effects.append("jump to {}".format(self.ip))
+            elif code == 99:
+                effects.append("halt")
+            print(instruction, "  ".join(effects))
+
+            if not carry_on:
+                return False
+            if self._pausing:
+                return True
+
+    def _run_fast(self):
+        # Flat dispatch loop - see _build_handlers.  Anything the loop can't do directly (mostly
+        # touching memory past the end of the list) raises, and is then handled by running that
+        # one instruction through the classic engine.
+        handlers = _handlers() if self.relative_mode else _without_relative_base(_handlers())
+        relative_mode = self.relative_mode
+        while True:
+            mem = self.memory
+            ip = self.ip
+            rb = self.relative_base
+            try:
+                while True:
+                    op = mem[ip]
+                    handler = handlers[op]
+                    if handler is not None:
+                        ip = handler(mem, ip, rb)
+                        continue
+
+                    if not relative_mode and _uses_relative_base(op):
+                        raise IndexError(op)  # Let the classic engine complain about it
+                    if op == 109:
+                        # Adjusting the relative base by a constant is very common - shortcut it
+                        rb += mem[ip+1]
+                        ip += 2
+                        if mem[ip] == 2106 and mem[ip+1] == 0:
+                            # Return straight after dropping the frame - see Superinstructions
+                            ip = mem[rb+mem[ip+2]]
+                        continue
+
+                    code = op % 100
+                    if code == 9:
+                        p = mem[ip+1]
+                        m = op // 100 % 10
+                        if m == 2: p = mem[rb+p]
+                        elif m == 0: p = mem[p]
+                        rb += p
+                        ip += 2
+                    elif code == 4:
+                        p = mem[ip+1]
+                        m = op // 100 % 10
+                        if m == 2: p = mem[rb+p]
+                        elif m == 0: p = mem[p]
+                        ip += 2
+                        if self.append_to_output(p):
+                            self.ip, self.relative_base = ip, rb
+                            return True
+                    elif code == 3:
+                        loc = mem[ip+1]
+                        if op // 100 % 10 == 2: loc += rb
+                        mem[loc]  # Make sure the address exists before using up the input
+                        self.ip, self.relative_base = ip, rb  # In case there isn't one yet
+                        self.store(self.get_input(), loc)
+                        mem = self.memory  # In case it didn't fit in compact memory
+                        ip += 2
+                    elif code == 99:
+                        self.ip, self.relative_base = ip+1, rb
+                        return False
+                    else:
+                        raise IndexError(op)
+            except (IndexError, OverflowError):
+                # Fall back to the classic engine for this instruction
+                self.ip, self.relative_base = ip, rb
+                if not self._step(use_cache=False):
+                    return False
+                if self._pausing:
+                    return True
+
+    def _run_jit(self):
+        # The fast engine's loop, but interpreting a block at a time - see BlockCache
+        handlers = _handlers(barrier=True)
+        if not self.relative_mode:
+            handlers = _without_relative_base(handlers)
+        relative_mode = self.relative_mode
+        cache = self._blocks
+        blocks, counts, codemap, invalidate = cache.blocks, cache.counts, cache.codemap, cache.invalidate
+        dirty = self._dirty
+        while True:
+            mem = self.memory
+            ip = self.ip
+            rb = self.relative_base
+            cache.resize(len(mem))
+            try:
+                while True:
+                    # ip is at the start of a block
+                    block = blocks.get(ip)
+                    if block is not None:
+                        ip, rb = block(mem, rb)
+                        continue
+
+                    count = counts.get(ip, 0) + 1
+                    counts[ip] = count
+                    if count == JIT_THRESHOLD and cache.compile(mem, ip) is not None:
+                        continue
+
+                    while True:
+                        op = mem[ip]
+                        handler = handlers[op]
+                        if handler is None:
+                            break
+                        ip = handler(mem, ip, rb, dirty, codemap, invalidate)
+                        if op % 100 in JUMP_TEMPLATES:
+                            break
+                    if handler is not None:
+                        # Jumped - start of a new block
+                        continue
+
+                    if not relative_mode and _uses_relative_base(op):
+                        raise IndexError(op)  # Let the classic engine complain about it
+                    code = op % 100
+                    if code == 9:
+                        p = mem[ip+1]
+                        m = op // 100 % 10
+                        if m == 2: p = mem[rb+p]
+                        elif m == 0: p = mem[p]
+                        rb += p
+                        ip += 2
+                    elif code == 4:
+                        p = mem[ip+1]
+                        m = op // 100 % 10
+                        if m == 2: p = mem[rb+p]
+                        elif m == 0: p = mem[p]
+                        ip += 2
+                        if self.append_to_output(p):
+                            self.ip, self.relative_base = ip, rb
+                            return True
+                    elif code == 3:
+                        loc = mem[ip+1]
+                        if op // 100 % 10 == 2: loc += rb
+                        mem[loc]  # Make sure the address exists before using up the input
+                        self.ip, self.relative_base = ip, rb  # In case there isn't one yet
+                        self.store(self.get_input(), loc)
+                        mem = self.memory  # In case it didn't fit in compact memory
+                        ip += 2
+                    elif code == 99:
+                        self.ip, self.relative_base = ip+1, rb
+                        return False
+                    else:
+                        raise IndexError(op)
+            except (IndexError, OverflowError) as e:
+                if isinstance(e, JitFault):
+                    ip, rb = e.args
+                # Fall back to the classic engine for this instruction
+                self.ip, self.relative_base = ip, rb
+                if not self._step(use_cache=False):
+                    return False
+                if self._pausing:
+                    return True
+
     def display(self, debug=False):
         print(self.memory)
         if debug:
             print(self.ip)
             print()
 
+# Asyncio
+# An AsyncComputer is run by awaiting run(), which takes its inputs from an asyncio.Queue and puts
+# its outputs to another, so lots of them can run on one event loop.  When there's no input, the
+# input instruction waits for one (and is then run again from the start).
+#
+# Programs that poll for input (like day 23's NICs) can be given empty_input whenever there's
+# nothing in the queue.  If a program asks again without having output anything since, it's
+# idle: it waits for a real input instead, and on_idle (if given) is called with the Computer.
+class AsyncComputer(Computer):
+    def __init__ (self, initial_memory_state, inputs=None, input_queue=None, output_queue=None,
+                  empty_input=None, on_idle=None, engine=None, compact=False):
+        import asyncio
+        super().__init__(initial_memory_state, inputs=inputs, pause_on_output=True, engine=engine, compact=compact)
+        self.input_queue = input_queue if input_queue is not None else asyncio.Queue()
+        self.output_queue = output_queue if output_queue is not None else asyncio.Queue()
+        self.empty_input = empty_input
+        self.on_idle = on_idle
+        self.idle = False  # Waiting for input, having been given empty_input and not output anything
+        self._polled = False  # Given empty_input since the last input or output
+
+    def _take_state(self, other):
+        # A fork gets queues of its own - restoring a snapshot keeps the ones it already has
+        import asyncio
+        super()._take_state(other)
+        if not hasattr(self, "input_queue"):
+            self.input_queue = asyncio.Queue()
+            self.output_queue = asyncio.Queue()
+        self.empty_input = other.empty_input
+        self.on_idle = other.on_idle
+        self.idle = False
+        self._polled = other._polled
+
+    def get_input(self):
+        import asyncio
+        if self._inputs:
+            return self._inputs.popleft()
+        try:
+            value = self.input_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            raise InputWait()  # See run()
+        self._polled = False
+        return value
+
+    async def _wait_for_input(self):
+        import asyncio
+        if self.empty_input is not None and not self._polled:
+            # Let everything else have a go before deciding there's nothing to read
+            self._polled = True
+            await asyncio.sleep(0)
+            if self.input_queue.empty():
+                self.inputs.append(self.empty_input)
+            return
+
+        if self.empty_input is not None:
+            self.idle = True
+            if self.on_idle:
+                self.on_idle(self)
+        value = await self.input_queue.get()
+        self.idle = False
+        self._polled = False
+        self.inputs.append(value)
+
+    async def run(self):
+        # Runs until the program halts, and returns all its output
+        outputs = []
+        while True:
+            output, halted = Computer.run(self)
+            if self.needs_input:
+                await self._wait_for_input()
+                continue
+
+            if output is not None:
+                outputs.append(output)
+                self._polled = False
+                await self.output_queue.put(output)
+            if halted:
+                return outputs
+
+# Networks
+# A Network runs a list of Computers (each one's address is its index) in turn, one at a time.
+# Each runs until it has output a packet of packet_size values, or needs an input that it
+# hasn't been sent.  route(address, packet) gives the address to send a packet to and the values
+# to send - by default the first value is the address, and the rest are sent.  Packets for
+# addresses outside the network wait in outbox.
+#
+# Computers that poll for input (day 23's NICs) can be given empty_input when there's nothing
+# for them, as with AsyncComputer: asking again without having output anything since means
+# they're waiting.  Only Computers that have something to do are scheduled, so the network is
+# idle exactly when there are none left, and large networks don't cost anything to wait on.
+class Network:
+    def __init__ (self, computers, packet_size=3, route=None, empty_input=None):
+        # The Network takes over each Computer's input_fun
+        self.computers = list(computers)
+        self.packet_size = packet_size
+        self.route = route or (lambda address, packet: (packet[0], packet[1:]))
+        self.empty_input = empty_input
+        self.queues = [deque() for _ in self.computers]  # Values sent to each address
+        self.outbox = deque()  # (address, values) for addresses outside the network
+        self._packets = [[] for _ in self.computers]  # What each Computer has output so far
+        self._polled = bytearray(len(self.computers))  # Given empty_input since its last output
+        self._waiting = set()  # Addresses of Computers waiting for input
+        self._halted = set()
+        self._ready = deque(range(len(self.computers)))  # Addresses of Computers to run, in turn
+        for address, computer in enumerate(self.computers):
+            computer.input_fun = self._input_fun(address)
+
+    def _input_fun (self, address):
+        queue = self.queues[address]
+        polled = self._polled
+        empty_input = self.empty_input
+        def get_input():
+            if queue:
+                return queue.popleft()
+            if empty_input is not None and not polled[address]:
+                polled[address] = 1
+                return empty_input
+            raise InputWait()
+        return get_input
+
+    def send (self, address, values):
+        if 0 <= address < len(self.computers):
+            self.queues[address].extend(values)
+            self._polled[address] = 0
+            if address in self._waiting:
+                self._waiting.discard(address)
+                self._ready.append(address)
+        else:
+            self.outbox.append((address, list(values)))
+
+    def run (self):
+        # Runs until there's a packet in outbox (returning True), or nothing can happen without
+        # something being sent - every Computer is waiting for input or has halted (False)
+        ready = self._ready
+        while ready and not self.outbox:
+            address = ready.popleft()
+            computer = self.computers[address]
+            packet = self._packets[address]
+            output = computer.run_until(n_outputs=self.packet_size - len(packet))
+            if output:
+                self._polled[address] = 0
+                packet += output
+            if computer.needs_input:
+                self._waiting.add(address)
+            elif computer.halted:
+                self._halted.add(address)
+            else:
+                self._packets[address] = []
+                self.send(*self.route(address, packet))
+                ready.append(address)
+
+        return bool(self.outbox)
+
+    def halted (self):
+        return len(self._halted) == len(self.computers)
+
+# Batches
+# run_batch runs one program over lots of independent inputs, in a pool of worker processes.
+# Each worker makes one Computer from the program when it starts, and reset()s it for every
+# set of inputs, so the program is only sent to each worker once.
+_batch_computer = None
+
+def _batch_init (program, engine, compact):
+    global _batch_computer
+    _batch_computer = Computer(ProgramImage(program), engine=engine, compact=compact)
+
+def _batch_run (inputs):
+    _batch_computer.reset(inputs=inputs)
+    return _batch_computer.run()
+
+def run_batch (program, list_of_inputs, workers=None, engine=None, compact=False, chunksize=None):
+    # Generates the output of running program with each of list_of_inputs, in the same order.
+    # workers defaults to one per CPU.  With workers=1 everything runs in this process.
+    program = list(program)
+    engine = engine or DEFAULT_ENGINE  # Workers might not see changes to DEFAULT_ENGINE
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        # A Computer of our own - the workers' global could be in use by another run_batch
+        computer = Computer(ProgramImage(program), engine=engine, compact=compact)
+        for inputs in list_of_inputs:
+            computer.reset(inputs=inputs)
+            yield computer.run()
+        return
+
+    if chunksize is None:
+        # Big enough that sending the work around doesn't cost more than doing it, but leaving
+        # several chunks per worker so they all finish at about the same time
+        chunksize = max(1, len(list_of_inputs) // (workers * 8)) if hasattr(list_of_inputs, "__len__") else 64
+    import multiprocessing
+    with multiprocessing.Pool(workers, initializer=_batch_init, initargs=(program, engine, compact)) as pool:
+        yield from pool.imap(_batch_run, list_of_inputs, chunksize)
+
+# Lock-step
+# run_lockstep runs many copies of one program at once, with their memory as the rows of a
+# numpy array.  Copies (lanes) at the same ip run each instruction together, as a handful of
+# numpy operations on all of them.  Lanes that branch differently carry on in separate groups,
+# and each pass runs one instruction for every group.
+#
+# Anything the vectorised code can't do exactly as a Computer would (numbers that might not fit
+# in 64 bits, negative addresses, running out of inputs, anything that isn't a valid
+# instruction) moves that lane to its own Computer, which finishes the run.
+#
+# Without numpy each copy is run in turn on one compact (array based) Computer instead.
+def _lockstep_params (mem, lanes, rb, ip, op, count):
+    # The values of the first count parameters of the instruction at ip, for each lane
+    params = []
+    modes = Instruction._decode_modes(op // 100)
+    for n in range(count):
+        raw = mem[lanes, ip+1+n]
+        if modes[n] == 1:
+            params.append(raw)
+        else:
+            params.append(mem[lanes, raw if modes[n] == 0 else rb[lanes] + raw])
+    return params
+
+def _lockstep_addresses (mem, lanes, rb, ip, op, count, write):
+    # The addresses the instruction at ip reads (and writes), or None if any of them are
+    # negative or the instruction isn't valid
+    modes = Instruction._decode_modes(op // 100)
+    if max(modes) > 2 or (write and modes[count-1] == 1):
+        return None
+    addresses = []
+    for n in range(count):
+        raw = mem[lanes, ip+1+n]
+        if modes[n] == 0:
+            addresses.append(raw)
+        elif modes[n] == 2:
+            addresses.append(rb[lanes] + raw)
+    if addresses:
+        lowest = min(int(a.min()) for a in addresses)
+        if lowest < 0:
+            return None
+        addresses.append(max(int(a.max()) for a in addresses))
+    else:
+        addresses.append(0)
+    return addresses
+
+_NUMPY = []
+def _numpy ():
+    # numpy, or None if it isn't installed - only looked for the first time it's wanted
+    if not _NUMPY:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _NUMPY.append(numpy)
+    return _NUMPY[0]
+
+LOCKSTEP_GROWTH = 4 * PAGE_SIZE  # The most the lanes' memory grows by at a time
+
+def _run_lockstep_numpy (program, list_of_inputs, engine):
+    np = _numpy()
+    lane_count = len(list_of_inputs)
+    try:
+        image = np.array(list(program), dtype=np.int64)
+    except OverflowError:
+        return None
+    mem = np.zeros((lane_count, len(image) + 4), dtype=np.int64)
+    mem[:, :len(image)] = image
+    ip = np.zeros(lane_count, dtype=np.int64)
+    rb = np.zeros(lane_count, dtype=np.int64)
+    inputs = [deque(i) for i in list_of_inputs]
+    outputs = [[] for _ in range(lane_count)]
+    escaped = {}  # lane -> Computer that's carrying on with it
+    running = np.arange(lane_count)
+
+    def escape (lanes):
+        for lane in lanes.tolist():
+            computer = Computer(mem[lane].tolist(), inputs=inputs[lane], engine=engine)
+            computer.ip, computer.relative_base = int(ip[lane]), int(rb[lane])
+            computer.output_buffer = outputs[lane]
+            escaped[lane] = computer
+
+    while running.size:
+        halted = []
+        order = np.argsort(ip[running], kind="stable")
+        running = running[order]
+        ips = ip[running]
+        starts = np.flatnonzero(np.diff(ips)) + 1
+        for group in np.split(running, starts):
+            at = int(ip[group[0]])
+            if at < 0 or at + 4 > mem.shape[1] + LOCKSTEP_GROWTH:
+                escape(group)
+                halted.append(group)
+                continue
+            if at + 4 > mem.shape[1]:
+                mem = np.concatenate([mem, np.zeros((lane_count, at + 4 - mem.shape[1]), dtype=np.int64)], axis=1)
+
+            ops = mem[group, at]
+            first = ops[0]
+            if (ops != first).any():
+                # Self-modifying code has given lanes different instructions - leave them all
+                # to Computers rather than split the group again
+                escape(group)
+                halted.append(group)
+                continue
+            op = int(first)
+            code = op % 100
+
+            count, write = { 1 : (3, True), 2 : (3, True), 7 : (3, True), 8 : (3, True),
+                             5 : (2, False), 6 : (2, False), 9 : (1, False),
+                             4 : (1, False), 3 : (1, True), 99 : (0, False) }.get(code, (None, None))
+            addresses = _lockstep_addresses(mem, group, rb, at, op, count, write) if count is not None else None
+            if addresses is None:
+                escape(group)
+                halted.append(group)
+                continue
+            if addresses[-1] >= mem.shape[1]:
+                limit = mem.shape[1] + LOCKSTEP_GROWTH
+                highest = addresses[-1]
+                if highest >= limit:
+                    # Growing every lane's memory that far could take more memory than there is -
+                    # the lanes going past limit carry on in Computers, whose memory is paged
+                    far = np.zeros(len(group), dtype=bool)
+                    for a in addresses[:-1]:
+                        far |= a >= limit
+                    escape(group[far])
+                    halted.append(group[far])
+                    group = group[~far]
+                    if not group.size:
+                        continue
+                    highest = max(int(a[~far].max()) for a in addresses[:-1])
+                if highest >= mem.shape[1]:
+                    # Grow every lane's memory - new cells are 0, as they would be for a Computer
+                    width = min(max(highest + 1, 2 * mem.shape[1]), limit)
+                    mem = np.concatenate([mem, np.zeros((lane_count, width - mem.shape[1]), dtype=np.int64)], axis=1)
+
+            if code == 99:
+                halted.append(group)
+            elif code in WRITE_TEMPLATES:
+                a, b = _lockstep_params(mem, group, rb, at, op, 2)
+                if code == 1:
+                    # Not np.abs, which leaves -2**63 negative
+                    big = (a >= 2**62) | (a <= -2**62) | (b >= 2**62) | (b <= -2**62)
+                elif code == 2:
+                    big = np.abs(a.astype(np.float64) * b) >= 2.0**62
+                else:
+                    big = None
+                if big is not None and big.any():
+                    # Might not fit in 64 bits - these lanes need Python's ints
+                    escape(group[big])
+                    halted.append(group[big])
+                    group, a, b = group[~big], a[~big], b[~big]
+                value = (a + b if code == 1 else a * b if code == 2 else
+                         (a < b).astype(np.int64) if code == 7 else (a == b).astype(np.int64))
+                dest = mem[group, at+3] + (rb[group] if op // 10000 % 10 == 2 else 0)
+                mem[group, dest] = value
+                ip[group] = at + 4
+            elif code == 5 or code == 6:
+                test, target = _lockstep_params(mem, group, rb, at, op, 2)
+                ip[group] = np.where((test != 0) if code == 5 else (test == 0), target, at + 3)
+            elif code == 9:
+                rb[group] += _lockstep_params(mem, group, rb, at, op, 1)[0]
+                ip[group] = at + 2
+            elif code == 4:
+                for lane, value in zip(group.tolist(), _lockstep_params(mem, group, rb, at, op, 1)[0].tolist()):
+                    outputs[lane].append(value)
+                ip[group] = at + 2
+            else:
+                starved = np.array([not inputs[lane] for lane in group.tolist()], dtype=bool)
+                if starved.any():
+                    # Let a Computer complain (or get it from input_fun) in the usual way
+                    escape(group[starved])
+                    halted.append(group[starved])
+                    group = group[~starved]
+                values = [inputs[lane].popleft() for lane in group.tolist()]
+                try:
+                    values = np.array(values, dtype=np.int64)
+                except OverflowError:
+                    for lane, value in zip(group.tolist(), values):
+                        inputs[lane].appendleft(value)
+                    escape(group)
+                    halted.append(group)
+                    continue
+                dest = mem[group, at+1] + (rb[group] if op // 100 % 10 == 2 else 0)
+                mem[group, dest] = values
+                ip[group] = at + 2
+
+        if halted:
+            running = np.setdiff1d(running, np.concatenate(halted), assume_unique=True)
+
+    for lane, computer in escaped.items():
+        outputs[lane] = computer.run()
+    return outputs
+
+def run_lockstep (program, list_of_inputs, use_numpy=None, engine=None):
+    # The outputs of running program with each of list_of_inputs (in the same order), exactly
+    # as if each was run on its own Computer
+    list_of_inputs = list(list_of_inputs)
+    if use_numpy is None:
+        use_numpy = _numpy() is not None
+    if use_numpy:
+        massert(_numpy() is not None, "run_lockstep(use_numpy=True) needs numpy")
+        outputs = _run_lockstep_numpy(program, list_of_inputs, engine)
+        if outputs is not None:
+            return outputs
+
+    computer = Computer(ProgramImage(program), engine=engine, compact=True)
+    outputs = []
+    for inputs in list_of_inputs:
+        computer.reset(inputs=list(inputs))
+        outputs.append(computer.run())
+    return outputs
+
+# Caching
+# Running a program with a given list of inputs (and no input_fun) always gives the same output,
+# so a RunCache keeps the outputs of recent runs, keyed by (program digest, inputs).  With a path
+# it also keeps every output in an sqlite database there, which other processes (and later runs)
+# can share.  Runs that don't halt - because they need more inputs - aren't cached.
+class RunCache:
+    def __init__ (self, maxsize=1024, path=None, engine=None):
+        # maxsize is the number of outputs to keep in memory (None for no limit, 0 for none)
+        self.maxsize = maxsize
+        self.engine = engine
+        self.hits = 0
+        self.misses = 0
+        self._recent = OrderedDict()  # (digest, inputs) -> output, least recently used first
+        self._computers = {}  # digest -> Computer to reset() for each run of that program
+        self._db = None
+        if path is not None:
+            import sqlite3
+            self._db = sqlite3.connect(path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS runs "
+                             "(program TEXT, inputs TEXT, output TEXT, PRIMARY KEY (program, inputs))")
+            self._db.commit()
+
+    def run (self, program, inputs=()):
+        # The output of running program (a ProgramImage is best - a list has to be hashed every
+        # time) with inputs.  Returns a new list, which the caller is free to change.
+        image = program if isinstance(program, ProgramImage) else ProgramImage(program)
+        key = (image.digest(), tuple(inputs))
+        output = self._recent.get(key)
+        if output is not None:
+            self._recent.move_to_end(key)
+            self.hits += 1
+            return list(output)
+
+        if self._db is not None:
+            row = self._db.execute("SELECT output FROM runs WHERE program = ? AND inputs = ?",
+                                   (key[0], json.dumps(key[1]))).fetchone()
+            if row is not None:
+                self.hits += 1
+                output = json.loads(row[0])
+                self._remember(key, output)
+                return list(output)
+
+        self.misses += 1
+        computer = self._computers.get(key[0])
+        if computer is None:
+            computer = self._computers[key[0]] = Computer(image, engine=self.engine)
+        computer.reset(inputs=inputs)
+        output = computer.run()  # Raises if it runs out of inputs - so nothing's cached
+        self._remember(key, output)
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?)",
+                             (key[0], json.dumps(key[1]), json.dumps(output)))
+            self._db.commit()
+        return list(output)
+
+    def _remember (self, key, output):
+        if self.maxsize == 0:
+            return
+        self._recent[key] = output
+        if self.maxsize is not None and len(self._recent) > self.maxsize:
+            self._recent.popitem(last=False)
+
+    def close (self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+# Recording and saving
+# A Recorder logs each input a Computer uses, and the step it was used at (see Computer.step),
+# so a Replay can run the same session again - at full speed, with any engine, since a program
+# does exactly the same thing given the same inputs.  Every checkpoint_every steps (at an input)
+# it also logs a checkpoint of the Computer's state, for a Replay to seek() from rather than
+# running the whole session again.  The log is a header and then records, all of them numbers
+# (see _pack_numbers) apart from the magic and the program's digest:
+#   header      RECORD_MAGIC, RECORD_VERSION, the digest of the program (32 bytes)
+#   input       RECORD_INPUT, steps since the last record, the value
+#   checkpoint  RECORD_CHECKPOINT, step, inputs used so far, ip, relative base, number of runs,
+#               then for each run of memory that isn't as it was in the program, its address,
+#               length and words
+# A Replay ignores a record cut short at the end, so a log is good up to wherever its session
+# stopped.
+RECORD_MAGIC = b"INTCLOG\0"
+RECORD_VERSION = 1
+RECORD_INPUT = 0
+RECORD_CHECKPOINT = 1
+CHECKPOINT_EVERY = 1000000  # Steps
+
+# Computer.save writes a Computer's state in the same way:
+#   SAVE_MAGIC, SAVE_VERSION, the digest of the program (32 bytes), the length of the path of its
+#   image file (0 if it didn't come from one) and the path in UTF-8, ip, relative base, steps,
+#   halted, relative_mode, the number of inputs still to use and them, the number of outputs not
+#   returned yet and them, then the runs of memory as in a checkpoint
+SAVE_MAGIC = b"INTCSAV\0"
+SAVE_VERSION = 1
+
+Checkpoint = namedtuple("Checkpoint", "step inputs_used ip relative_base runs")
+
+def _pack_numbers (out, numbers):
+    # Appends numbers of any size to the bytearray out: zigzag encoded (0, -1, 1, -2...) so small
+    # negative numbers are small too, then 7 bits a byte, lowest first, the top bit set on all but
+    # the last byte
+    for n in numbers:
+        n = n << 1 if n >= 0 else (-n << 1) - 1
+        while n > 0x7f:
+            out.append(n & 0x7f | 0x80)
+            n >>= 7
+        out.append(n)
+
+def _unpack_numbers (data, pos, count):
+    # count numbers from data (see _pack_numbers) at pos - returns them and the position after them.
+    # Raises IndexError if data ends first.
+    numbers = []
+    for _ in range(count):
+        n = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            n |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        numbers.append(n >> 1 if not n & 1 else -((n + 1) >> 1))
+    return numbers, pos
+
+def _changed_runs (computer):
+    # (address, words) for each chunk of the Computer's memory that isn't as it is in its image,
+    # including chunks of the pages beyond it that aren't all 0s.  Chunks the Computer knows
+    # haven't been written to since the start (see DIRTY_ENGINES) aren't even looked at.
+    image = computer.image
+    memory = computer.memory
+    dirty = computer._dirty
+    compact = isinstance(memory, array)
+    size = 1 << DIRTY_BITS
+    runs = []
+    for n in range((len(memory) + size - 1) >> DIRTY_BITS):
+        if dirty is not None and not dirty[n]:
+            continue
+        words = memory[n*size:(n+1)*size]
+        if words != image.chunk(n, compact)[:len(words)]:
+            runs.append((n * size, words))
+    for page_num in sorted(computer.pages):
+        page = computer.pages[page_num]
+        for start in range(0, PAGE_SIZE, size):
+            if any(page[start:start+size]):
+                runs.append((page_num * PAGE_SIZE + start, page[start:start+size]))
+    return runs
+
+def _pack_runs (out, runs):
+    # The number of runs, then each one's address, length and words
+    _pack_numbers(out, [len(runs)])
+    for loc, words in runs:
+        _pack_numbers(out, [loc, len(words)])
+        _pack_numbers(out, words)
+
+def _unpack_runs (data, pos):
+    (count,), pos = _unpack_numbers(data, pos, 1)
+    runs = []
+    for _ in range(count):
+        (loc, length), pos = _unpack_numbers(data, pos, 2)
+        words, pos = _unpack_numbers(data, pos, length)
+        runs.append((loc, words))
+    return runs, pos
+
+def _restore_runs (computer, runs):
+    # Puts runs (see _changed_runs) back into a new Computer made from the same image
+    dirty = computer._dirty
+    for loc, words in runs:
+        end = loc + len(words)
+        if end > len(computer.memory):
+            # Past the end of memory - a word at a time
+            for n, word in enumerate(words):
+                computer.store(word, loc + n)
+            continue
+        try:
+            computer.memory[loc:end] = array('q', words) if computer.compact else words
+        except OverflowError:
+            computer._widen()
+            computer.memory[loc:end] = words
+        if dirty is not None:
+            first, last = loc >> DIRTY_BITS, (end - 1) >> DIRTY_BITS
+            dirty[first:last+1] = b"\x01" * (last + 1 - first)
+
+class Recorder:
+    def __init__ (self, computer, path, checkpoint_every=CHECKPOINT_EVERY):
+        # Logs computer's session to path from now on, until close().  The Computer has to be made
+        # from a ProgramImage, and use an engine that counts steps (see COUNTING_ENGINES).
+        massert(computer.image is not None, "Recording needs a Computer made from a ProgramImage")
+        assert computer.engine in COUNTING_ENGINES, "Recording needs an engine that counts steps: {}".format(COUNTING_ENGINES)
+        self.computer = computer
+        self.checkpoint_every = checkpoint_every
+        self.inputs_used = 0
+        self._file = open(path, "wb")
+        header = bytearray(RECORD_MAGIC)
+        _pack_numbers(header, [RECORD_VERSION])
+        header += bytes.fromhex(computer.image.digest())
+        self._file.write(header)
+        self._checkpoint()  # Where the session starts - which needn't be the start of the program
+        computer.input_log = self._input
+
+    def _input (self, val):
+        computer = self.computer
+        if computer.steps - self._checkpoint_step >= self.checkpoint_every:
+            self._checkpoint()
+        record = bytearray()
+        _pack_numbers(record, [RECORD_INPUT, computer.steps - self._last_step, val])
+        self._file.write(record)
+        self._last_step = computer.steps
+        self.inputs_used += 1
+
+    def _checkpoint (self):
+        # The Computer is about to use an input (or start), so ip is at that instruction
+        computer = self.computer
+        record = bytearray()
+        _pack_numbers(record, [RECORD_CHECKPOINT, computer.steps, self.inputs_used, computer.ip,
+                               computer.relative_base])
+        _pack_runs(record, _changed_runs(computer))
+        self._file.write(record)
+        self._file.flush()
+        self._checkpoint_step = self._last_step = computer.steps
+
+    def close (self):
+        if self._file is not None:
+            self.computer.input_log = None
+            self._file.close()
+            self._file = None
+
+class Replay:
+    def __init__ (self, path):
+        # Reads a log written by a Recorder
+        with open(path, "rb") as f:
+            data = f.read()
+        assert data.startswith(RECORD_MAGIC), "Not an Intcode session log: {}".format(path)
+        (version,), pos = _unpack_numbers(data, len(RECORD_MAGIC), 1)
+        assert version == RECORD_VERSION, "Session log version {} (not {}): {}".format(version, RECORD_VERSION, path)
+        self.digest = data[pos:pos+32].hex()
+        pos += 32
+        self.inputs = []  # (step, value) for each input used
+        self.checkpoints = []  # Checkpoint for each, first to last
+        step = 0
+        try:
+            while pos < len(data):
+                (kind,), pos = _unpack_numbers(data, pos, 1)
+                if kind == RECORD_INPUT:
+                    (steps, val), pos = _unpack_numbers(data, pos, 2)
+                    step += steps
+                    self.inputs.append((step, val))
+                else:
+                    header, pos = _unpack_numbers(data, pos, 4)
+                    runs, pos = _unpack_runs(data, pos)
+                    self.checkpoints.append(Checkpoint(*header, runs))
+                    step = header[0]
+        except IndexError:
+            pass  # The session stopped part way through writing a record
+        self.steps = step  # When the last input was used (or the last checkpoint was taken)
+
+    def start (self, image, **kwargs):
+        # A new Computer where the session started, with all the logged inputs to use - run() it to
+        # replay the whole session.  kwargs are for the Computer (e.g. engine).
+        return self._restore(image, self.checkpoints[0], kwargs)
+
+    def seek (self, image, step=None, **kwargs):
+        # A new Computer at step in the session: restored from the last checkpoint before it and
+        # then stepped the rest of the way (see Computer.step), with the logged inputs it hasn't
+        # used yet still to use.  Without step it's just the last checkpoint - to carry on the
+        # session from there, run it until it needs input (see run_until).
+        massert(step is None or step >= self.checkpoints[0].step, "The session started at step", self.checkpoints[0].step)
+        checkpoint = self.checkpoints[-1]
+        if step is not None:
+            checkpoint = [c for c in self.checkpoints if c.step <= step][-1]
+        computer = self._restore(image, checkpoint, kwargs)
+        if step is not None:
+            computer.step(step - checkpoint.step)
+        return computer
+
+    def _restore (self, image, checkpoint, kwargs):
+        assert image.digest() == self.digest, "This session was of a different program"
+        inputs = [val for _, val in self.inputs[checkpoint.inputs_used:]]
+        computer = Computer(image, inputs=inputs, **kwargs)
+        _restore_runs(computer, checkpoint.runs)
+        computer.ip = checkpoint.ip
+        computer.relative_base = checkpoint.relative_base
+        computer.steps = checkpoint.step
+        return computer
+
 def test (program, inputs=None, input_fun=None, output=None, expected_mem=None, expected_mem_len=None):
     p = Computer(program, inputs=inputs, input_fun=input_fun)
     p_out = p.run()
@@ -429,7 +2152,6 @@ def test_day5_2_puzzle ():
     test(program, inputs=[5], output="8805067")
 
 # Day 7
-import sys
 
 def find_largest_output (limits, program, fun):
     biggest_output = 0
@@ -480,54 +2202,14 @@ def day7part1fun(program, aa,bb,cc,dd,ee):
     return outE
 
 def day7part2fun(program, aa,bb,cc,dd,ee):
-    # Assumes loop runs through more than once
-    ampA = Computer(program, inputs=[aa, 0], pause_on_output=True)
-    outA, stopped = ampA.run()
-    assert (not stopped)
-    ampB = Computer(program, inputs=[bb, outA], pause_on_output=True)
-    outB, stopped = ampB.run()
-    assert (not stopped)
-    ampC = Computer(program, inputs=[cc, outB], pause_on_output=True)
-    outC, stopped = ampC.run()
-    assert (not stopped)
-    ampD = Computer(program, inputs=[dd, outC], pause_on_output=True)
-    outD, stopped = ampD.run()
-    assert (not stopped)
-    ampE = Computer(program, inputs=[ee, outD], pause_on_output=True)
-    outE, stopped = ampE.run()
-    assert (not stopped)
-
-    finalE = outE
-
-    halting = False
-    while not halting:
-        ampA.inputs.append(outE)
-        outA, a_stopped = ampA.run()
-        if a_stopped:
-            halting = True
-
-        if outA: ampB.inputs.append(outA)
-        outB, b_stopped = ampB.run()
-        if halting:
-            assert(b_stopped)
-
-        if outB: ampC.inputs.append(outB)
-        outC, c_stopped = ampC.run()
-        if halting:
-            assert(c_stopped)
-
-        if outC: ampD.inputs.append(outC)
-        outD, d_stopped = ampD.run()
-        if halting:
-            assert(d_stopped)
-
-        if outD: ampE.inputs.append(outD)
-        outE, e_stopped = ampE.run()
-        if halting:
-            assert(e_stopped)
-            return finalE
-        else:
-            finalE=outE
+    # Each amp's output goes to the next one's input, and E's back to A's
+    amps = [Computer(program, inputs=[phase]) for phase in (aa,bb,cc,dd,ee)]
+    network = Network(amps, packet_size=1, route=lambda address, packet: ((address+1) % 5, packet))
+    network.send(0, [0])
+    network.run()
+    assert(network.halted())
+    # E's last output is still waiting for A, which has halted
+    return network.queues[0][-1]
 
 
 def test_day7():
@@ -545,27 +2227,539 @@ def test_day7():
     assert(18216 == find_largest_output((5,10), [3,52,1001,52,-5,52,3,53,1,52,56,54,1007,54,5,55,1005,55,26,1001,54,-5,54,1105,1,12,1,53,54,53,1008,54,0,55,1001,55,1,55,2,53,55,53,4,53,1001,56,-1,56,1005,56,6,99,0,0,0,0,10], day7part2fun)[0])
     assert(44282086 == find_largest_output((5,10), DAY_7_PROGRAM, day7part2fun)[0])
 
-def test_day_9():
+def test_day_9(**kwargs):
     DAY_9_PROGRAM=[1102,34463338,34463338,63,1007,63,34463338,63,1005,63,53,1101,3,0,1000,109,988,209,12,9,1000,209,6,209,3,203,0,1008,1000,1,63,1005,63,65,1008,1000,2,63,1005,63,904,1008,1000,0,63,1005,63,58,4,25,104,0,99,4,0,104,0,99,4,17,104,0,99,0,0,1102,0,1,1020,1102,29,1,1001,1101,0,28,1016,1102,1,31,1011,1102,1,396,1029,1101,26,0,1007,1101,0,641,1026,1101,466,0,1023,1101,30,0,1008,1102,1,22,1003,1101,0,35,1019,1101,0,36,1018,1102,1,37,1012,1102,1,405,1028,1102,638,1,1027,1102,33,1,1000,1102,1,27,1002,1101,21,0,1017,1101,0,20,1015,1101,0,34,1005,1101,0,23,1010,1102,25,1,1013,1101,39,0,1004,1101,32,0,1009,1101,0,38,1006,1101,0,473,1022,1102,1,1,1021,1101,0,607,1024,1102,1,602,1025,1101,24,0,1014,109,22,21108,40,40,-9,1005,1013,199,4,187,1105,1,203,1001,64,1,64,1002,64,2,64,109,-17,2102,1,4,63,1008,63,32,63,1005,63,229,4,209,1001,64,1,64,1105,1,229,1002,64,2,64,109,9,21108,41,44,1,1005,1015,245,1105,1,251,4,235,1001,64,1,64,1002,64,2,64,109,4,1206,3,263,1105,1,269,4,257,1001,64,1,64,1002,64,2,64,109,-8,21102,42,1,5,1008,1015,42,63,1005,63,291,4,275,1105,1,295,1001,64,1,64,1002,64,2,64,109,-13,1208,6,22,63,1005,63,313,4,301,1105,1,317,1001,64,1,64,1002,64,2,64,109,24,21107,43,44,-4,1005,1017,339,4,323,1001,64,1,64,1105,1,339,1002,64,2,64,109,-5,2107,29,-8,63,1005,63,361,4,345,1001,64,1,64,1105,1,361,1002,64,2,64,109,-4,2101,0,-3,63,1008,63,32,63,1005,63,387,4,367,1001,64,1,64,1106,0,387,1002,64,2,64,109,13,2106,0,3,4,393,1001,64,1,64,1105,1,405,1002,64,2,64,109,-27,2102,1,2,63,1008,63,35,63,1005,63,425,1105,1,431,4,411,1001,64,1,64,1002,64,2,64,109,5,1202,2,1,63,1008,63,31,63,1005,63,455,1001,64,1,64,1106,0,457,4,437,1002,64,2,64,109,19,2105,1,1,1001,64,1,64,1105,1,475,4,463,1002,64,2,64,109,-6,21102,44,1,1,1008,1017,45,63,1005,63,499,1001,64,1,64,1105,1,501,4,481,1002,64,2,64,109,6,1205,-2,513,1106,0,519,4,507,1001,64,1,64,1002,64,2,64,109,-17,1207,-1,40,63,1005,63,537,4,525,1106,0,541,1001,64,1,64,1002,64,2,64,109,-8,1201,9,0,63,1008,63,38,63,1005,63,567,4,547,1001,64,1,64,1106,0,567,1002,64,2,64,109,-3,2101,0,6,63,1008,63,32,63,1005,63,591,1001,64,1,64,1105,1,593,4,573,1002,64,2,64,109,22,2105,1,8,4,599,1106,0,611,1001,64,1,64,1002,64,2,64,109,8,1206,-4,625,4,617,1105,1,629,1001,64,1,64,1002,64,2,64,109,3,2106,0,0,1106,0,647,4,635,1001,64,1,64,1002,64,2,64,109,-29,2107,27,9,63,1005,63,667,1001,64,1,64,1106,0,669,4,653,1002,64,2,64,109,7,1207,-4,28,63,1005,63,689,1001,64,1,64,1105,1,691,4,675,1002,64,2,64,109,-7,2108,30,3,63,1005,63,711,1001,64,1,64,1105,1,713,4,697,1002,64,2,64,109,17,21101,45,0,-5,1008,1010,45,63,1005,63,735,4,719,1106,0,739,1001,64,1,64,1002,64,2,64,109,-9,1202,-2,1,63,1008,63,39,63,1005,63,765,4,745,1001,64,1,64,1106,0,765,1002,64,2,64,109,10,21101,46,0,-5,1008,1011,48,63,1005,63,785,1106,0,791,4,771,1001,64,1,64,1002,64,2,64,109,-10,1208,0,36,63,1005,63,811,1001,64,1,64,1105,1,813,4,797,1002,64,2,64,109,7,1205,8,827,4,819,1105,1,831,1001,64,1,64,1002,64,2,64,109,-15,2108,27,4,63,1005,63,853,4,837,1001,64,1,64,1106,0,853,1002,64,2,64,109,14,1201,-3,0,63,1008,63,30,63,1005,63,877,1001,64,1,64,1106,0,879,4,859,1002,64,2,64,109,11,21107,47,46,-5,1005,1018,899,1001,64,1,64,1105,1,901,4,885,4,64,99,21101,0,27,1,21101,0,915,0,1105,1,922,21201,1,31783,1,204,1,99,109,3,1207,-2,3,63,1005,63,964,21201,-2,-1,1,21101,0,942,0,1106,0,922,21201,1,0,-1,21201,-2,-3,1,21101,0,957,0,1105,1,922,22201,1,-1,-2,1106,0,968,22102,1,-2,-2,109,-3,2105,1,0]
     # Quine
     program = [109,1,204,-1,1001,100,1,100,1008,100,16,101,1006,101,0,99]
-    assert(program == Computer(program).run())
+    assert(program == Computer(program, **kwargs).run())
 
     # 16-digit number
-    out = Computer([1102,34915192,34915192,7,4,7,99,0]).run()
+    out = Computer([1102,34915192,34915192,7,4,7,99,0], **kwargs).run()
     assert(len(out) == 1)
     out = out[0]
     assert(out // 10**(16-1) > 0)
     assert(out // 10**(17-1) == 0)
 
     # Middle number - 1125899906842624
-    assert(Computer([104,1125899906842624,99]).run()[0] == 1125899906842624)
+    assert(Computer([104,1125899906842624,99], **kwargs).run()[0] == 1125899906842624)
 
     # Day 9 part 1
-    assert(Computer(DAY_9_PROGRAM, inputs=[1]).run()[0] == 2350741403)
+    assert(Computer(DAY_9_PROGRAM, inputs=[1], **kwargs).run()[0] == 2350741403)
 
     # Day 9 part 2 - slow! (5 seconds or so)
-    assert(Computer(DAY_9_PROGRAM, inputs=[2]).run()[0] == 53088)
+    assert(Computer(DAY_9_PROGRAM, inputs=[2], **kwargs).run()[0] == 53088)
+
+def test_self_modifying():
+    # Loops that rewrite their own code, after the JIT engine has compiled them
+    # Adds 1 to a counter until it reaches 60, then rewrites the add to step by 5
+    program = [1001,50,1,50, 1008,50,60,51, 1005,51,24, 1007,50,203,51, 1005,51,0, 4,50, 99,0,0,0,
+               1101,0,5,2, 1105,1,0]
+    test(program, output="205")
+
+    # Adds 1, 2, 3... to a counter, by incrementing the add's own parameter
+    program = [1001,50,1,50, 1001,2,1,2, 1007,50,5000,51, 1005,51,0, 4,50, 99]
+    test(program, output="5050")
+
+def test_superinstructions():
+    # Calls and returns through a stack frame, which the fast engine runs as fused pairs
+    program = [109,40, 21101,9,0,0, 1105,1,20, 21101,16,0,0, 1105,1,20, 4,19, 99,0,
+               109,2, 1001,19,7,19, 109,-2, 2106,0,0] + [0] * 20
+    assert([ip for ip in range(31) if fused_with_next(program, ip)] == [2, 9, 26])
+    test(program, output="14")
+
+    # The compare writes over its own jump, turning it into an add, so they mustn't be fused
+    program = [1107,1,2,4, 1005,4,12,14, 4,14, 99, 0,20,0,0]
+    assert(fused_with_next(program, 0))
+    test(program, output="21")
+
+    # Only fused if the jump tests what the compare wrote
+    assert(not fused_with_next([1007,9,1,10, 1005,9,0, 99, 0,0,0], 0))
+
+def test_relative_mode():
+    # Before day 9 there was no relative base
+    program = [3,9,8,9,10,9,4,9,99,-1,8]
+    p = Computer(program, inputs=[8], relative_mode=False)
+    assert(not p.fork().relative_mode and p.run() == [1])
+    assert(Computer(program, inputs=[8], relative_mode=False, compact=True).run() == [1])
+
+    for program in ([109,1, 99], [204,0, 99], [1101,1,1,20, 22101,1,1,1, 99]):
+        try:
+            Computer(program, inputs=[1], relative_mode=False).run()
+            assert(False)
+        except AssertionError as e:
+            assert(str(e).startswith("No relative base for"))
+
+    # Even once the fast engines have run the same code with one
+    program = [1101,0,0,20, 1001,20,1,20, 1007,20,100,21, 1005,21,4, 209,20, 99] + [0] * 4
+    assert(Computer(program).run() == [])
+    try:
+        Computer(program, relative_mode=False).run()
+        assert(False)
+    except AssertionError as e:
+        assert(str(e) == "No relative base for 209 at 15")
+
+def test_high_memory():
+    # Writing to a very high address only allocates the page it's on
+    program = [1101,5,6,1000000000, 4,1000000000, 4,2000000000, 99]
+    p = Computer(program)
+    assert(p.run() == [11, 0])
+    assert(len(p.memory) == len(program))
+    assert(list(p.pages.keys()) == [1000000000 // PAGE_SIZE])
+
+    # Writes just past the end grow memory instead, and pick up any pages in the way
+    program = [1101,0,7,1500, 1101,0,8,1000, 1101,0,9,1100, 4,1500, 4,1000, 4,1100, 99]
+    p = Computer(program)
+    assert(p.run() == [7, 8, 9])
+    assert(len(p.memory) == 2 * PAGE_SIZE)
+    assert(p.pages == {})
+
+def test_image_files():
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "quine.intcode")
+    program = [109,1,204,-1,1001,100,1,100,1008,100,16,101,1006,101,0,99]
+    ProgramImage(program).save(path)
+    assert(os.path.getsize(path) == IMAGE_HEADER.size + 8 * len(program))
+    image = ProgramImage.load(path)
+    assert(isinstance(image.words, memoryview) and list(image) == program)
+    assert(image.digest() == ProgramImage(program).digest())
+    for compact in (False, True):
+        p = Computer(image, compact=compact)
+        assert(p.run() == program and p.compact == compact)
+        p.reset()
+        assert(p.run() == program)
+
+    # Words that don't fit in 64 bits (or are BIG_WORD) are stored after the rest
+    program = [104,2**64,104,-2**63,104,-2**200,104,2**63-1,99]
+    ProgramImage(program).save(path)
+    image = ProgramImage.load(path)
+    assert(list(image) == program)
+    assert(Computer(image, compact=True).run() == program[1:-1:2])
+
+    with open(path, "wb") as f:
+        f.write(b"3,0,4,0,99" + bytes(IMAGE_HEADER.size))
+    try:
+        ProgramImage.load(path)
+        assert(False)
+    except AssertionError as e:
+        assert(str(e).startswith("Not an Intcode image"))
+    shutil.rmtree(folder)
+
+def test_compact_memory():
+    # Values too big for 64 bits switch to list memory, wherever they're written
+    program = [1102,1099511627776,1099511627776,9, 4,9, 99, 0,0,0]
+    p = Computer(program, compact=True)
+    assert(p.run() == [2**80])
+    assert(not p.compact and isinstance(p.memory, list))
+
+    p = Computer([1102,1099511627776,1099511627776,1000000, 4,1000000, 3,1000001, 4,1000001, 99], inputs=[-2**70], compact=True)
+    assert(p.run() == [2**80, -2**70])
+    assert(not p.compact)
+
+    # Or start off with list memory if the program already has them
+    p = Computer([104,2**64,99], compact=True)
+    assert(p.run() == [2**64])
+    assert(not p.compact)
+
+    # Nothing too big - stays compact
+    p = Computer([1101,2,3,1000000, 4,1000000, 99], compact=True)
+    assert(p.run() == [5])
+    assert(p.compact and isinstance(p.pages[1000000 // PAGE_SIZE], array))
+
+def test_fork():
+    # Adds each input to a total (kept at a high address, so on a page) and outputs the total.
+    # Also moves the relative base on by 1 each time.
+    program = [3,100, 1,100,100000,100000, 4,100000, 109,1, 1105,1,0]
+    p = Computer(program, inputs=[1, 2], pause_on_output=True)
+    assert(p.run() == (1, False))
+
+    f = p.fork()
+    assert(list(f.inputs) == [2] and f.inputs is not p.inputs)
+    assert(f.output_buffer is not p.output_buffer)
+    assert(p.run() == (3, False) and f.run() == (3, False))
+    p.inputs.append(10)
+    f.inputs.append(100)
+    assert(p.run() == (13, False) and f.run() == (103, False))
+    assert(p.memory[100] == 10 and f.memory[100] == 100)
+    assert(p.relative_base == f.relative_base == 2)
+
+    # Go back to an earlier state, as many times as you like
+    snap = f.snapshot()
+    for _ in range(2):
+        f.inputs.append(1000)
+        assert(f.run() == (1103, False))
+        f.restore(snap)
+    assert(f.memory[100] == 100 and f.relative_base == 2)
+    f.inputs.append(1)
+    assert(f.run() == (104, False))
+    p.inputs.append(1)  # p is unaffected by all of this
+    assert(p.run() == (14, False))
+    assert(snap.memory[100] == 100 and snap.get(100000) == 103)
+
+def test_reset():
+    # Each run multiplies its input by a number in its own code, after adding 1 to it (so 3), and
+    # uses some high memory.  reset() must undo all of that.
+    image = ProgramImage([3,100, 1001,7,1,7, 102,2,100,100, 4,100, 21101,0,7,5000, 99])
+    for compact in (False, True):
+        p = Computer(image, compact=compact)
+        for n in range(60):
+            p.reset(inputs=[n])
+            assert(p.run() == [n*3])
+            assert(p.get(5000) == 7 and p.ip == 17)
+
+        # An input too big for compact memory, after memory has grown (so in the fast loop)
+        p.reset(inputs=[2**70])
+        assert(p.run() == [3 * 2**70])
+
+        p.reset()
+        assert(list(p.memory[:len(image)]) == list(image) and not any(p.memory[len(image):]))
+        assert(p.pages == {} and not p.inputs)
+        assert(p.compact == compact)
+
+    # Turns its add into a multiply after the first input, which must be an add again after reset
+    p = Computer(ProgramImage([3,100, 1005,100,7, 99,0, 1,100,100,100, 4,100, 1101,0,2,7, 1105,1,0]))
+    for _ in range(60):
+        p.reset(inputs=[3, 3, 3, 0])
+        assert(p.run() == [6, 9, 9])
+
+    # A high page that the dense memory grows over is still put back
+    p = Computer(ProgramImage([21101,0,7,1500, 21101,0,8,1030, 99]))
+    p.run()
+    p.reset()
+    assert(p.get(1500) == 0 and p.get(1030) == 0 and p.get(0) == 21101)
+
+    # Resetting a fork doesn't change what it was forked from
+    p = Computer(image, inputs=[4])
+    f = p.fork()
+    f.reset(inputs=[5])
+    assert(f.run() == [15] and p.run() == [12])
+
+def test_run_batch():
+    # Multiplies its two inputs - outputs come back in order, in and out of process
+    program = [3,0, 3,1, 2,0,1,0, 4,0, 99]
+    pairs = [(x, y) for x in range(-20, 20) for y in range(5)]
+    expected = [[x * y] for x, y in pairs]
+    assert(list(run_batch(program, pairs, workers=1)) == expected)
+    assert(list(run_batch(program, pairs, workers=3)) == expected)
+    assert(list(run_batch(program, iter(pairs), workers=2)) == expected)
+    # Two in-process batches at once each keep their own Computer
+    add = [3,0, 3,1, 1,0,1,0, 4,0, 99]
+    both = list(zip(run_batch(program, pairs, workers=1), run_batch(add, pairs, workers=1)))
+    assert(both == [([x * y], [x + y]) for x, y in pairs])
+
+def test_run_lockstep():
+    # Must match separate Computers exactly - including lanes that branch differently, need big
+    # numbers, use high memory or modify their own code
+    cases = [([3,21,1008,21,8,20,1005,20,22,107,8,21,20,1006,20,31,1106,0,36,98,0,0,1002,21,125,20,4,20,1105,1,46,104,999,1105,1,46,1101,1000,1,20,4,20,1105,1,46,98,99],
+              [[n] for n in range(-3, 15)]),
+             ([3,100, 2,100,100,100, 4,100, 109,1000, 21101,0,5,700, 204,700, 99],
+              [[3], [2**40], [-7], [2**70], [0]]),
+             ([3,100, 1005,100,7, 99,0, 1,100,100,100, 4,100, 1101,0,2,7, 1105,1,0],
+              [[3, 3, 3, 0], [0], [5, 0], [1, 2, 0]]),
+             ([3,100, 1001,100,-1,100, 4,100, 99],
+              [[-2**63], [2**63-1], [-2**62], [5]]),
+             ([1101,1,1,10**10, 4,10**10, 99], [[]] * 4),
+             ([3,100, 9,100, 21101,1,1,0, 204,0, 99],
+              [[200], [5000], [10**10], [10**12], [200]])]
+    for program, list_of_inputs in cases:
+        expected = [Computer(program, inputs=list(inputs)).run() for inputs in list_of_inputs]
+        assert(run_lockstep(program, list_of_inputs, use_numpy=False) == expected)
+        if _numpy() is not None:
+            assert(run_lockstep(program, list_of_inputs, use_numpy=True) == expected)
+
+def test_run_cache():
+    image = ProgramImage([3,0, 3,1, 2,0,1,0, 4,0, 99])  # Multiplies its inputs
+    cache = RunCache(maxsize=2)
+    assert(cache.run(image, (3, 4)) == [12] and cache.run(image, [3, 4]) == [12])
+    assert((cache.hits, cache.misses) == (1, 1))
+    cache.run(image, (5, 6)).append(1)  # Changing what's returned doesn't change the cache
+    cache.run(image, (7, 8))  # Pushes (3, 4) out
+    assert(cache.run(image, (5, 6)) == [30] and cache.run(image, (3, 4)) == [12])
+    assert((cache.hits, cache.misses) == (2, 4))
+
+    # Runs that need more inputs aren't cached
+    for _ in range(2):
+        try:
+            cache.run(image, (1,))
+            assert(False)
+        except AssertionError as e:
+            assert(str(e) == "No inputs available")
+    assert(cache.misses == 6)
+
+    # On disk, outputs are shared between caches - for any size of number
+    path = os.path.join(tempfile.mkdtemp(), "runs.sqlite")
+    first = RunCache(path=path)
+    assert(first.run([3,0, 3,1, 2,0,1,0, 4,0, 99], (2**40, 2**40)) == [2**80])
+    first.close()
+    second = RunCache(maxsize=0, path=path)
+    assert(second.run(image, (2**40, 2**40)) == [2**80] and second.run(image, (2**40, 2**40)) == [2**80])
+    assert((second.hits, second.misses) == (2, 0))
+    second.close()
+    shutil.rmtree(os.path.dirname(path))
+
+def test_async_computer():
+    import asyncio
+    async def doubler_chain():
+        # Three Computers doubling their inputs, each one's output feeding the next one's input
+        double = [3,20, 1002,20,2,20, 4,20, 1105,1,0]
+        queues = [asyncio.Queue() for _ in range(4)]
+        computers = [AsyncComputer(double, input_queue=queues[n], output_queue=queues[n+1]) for n in range(3)]
+        tasks = [asyncio.ensure_future(c.run()) for c in computers]
+        results = []
+        for n in range(5):
+            await queues[0].put(n)
+            results.append(await queues[3].get())
+        for task in tasks:
+            task.cancel()
+        return results
+    assert(asyncio.run(doubler_chain()) == [0, 8, 16, 24, 32])
+
+    async def poller():
+        # Reads until it gets a non-zero value (counting the polls), which it outputs then halts
+        idle = []
+        c = AsyncComputer([3,30, 1005,30,12, 1001,31,1,31, 1105,1,0, 4,30, 99]+[0]*17, empty_input=0,
+                          on_idle=idle.append)
+        task = asyncio.ensure_future(c.run())
+        await asyncio.sleep(0.01)
+        assert(idle == [c] and c.idle and c.get(31) == 1)  # One empty_input, then waits
+        await c.input_queue.put(7)
+        return await task
+    assert(asyncio.run(poller()) == [7])
+
+    async def forked():
+        # A fork carries on from the same state, with queues of its own
+        original = AsyncComputer([3,20, 1001,20,1,21, 4,21, 3,20, 1,20,21,21, 4,21, 99] + [0]*5)
+        await original.input_queue.put(10)
+        assert(Computer.run(original) == (11, False))  # Stops after the first output
+        copy = original.fork()
+        assert(copy.input_queue is not original.input_queue and copy.output_queue is not original.output_queue)
+        tasks = [asyncio.ensure_future(c.run()) for c in (original, copy)]
+        await original.input_queue.put(100)
+        await copy.input_queue.put(200)
+        results = [await task for task in tasks]
+        assert([await c.output_queue.get() for c in (original, copy)] == [111, 211])
+        # Restoring a snapshot keeps the Computer's own queues
+        queue = copy.input_queue
+        copy.restore(original)
+        assert(copy.input_queue is queue and copy.halted)
+        return results
+    assert(asyncio.run(forked()) == [[111], [211]])
+
+def test_network():
+    # A token passed along a chain of 10000 Computers, each adding 1 to it, then sent out of the
+    # network - which is then idle (with the Computers waiting for the next token)
+    relay = [3,100, 3,101, 1001,100,1,102, 1001,101,1,101, 4,102, 4,101, 1105,1,2]
+    network = Network([Computer(relay, inputs=[n]) for n in range(10000)], packet_size=2)
+    network.send(0, [0])
+    assert(network.run() and list(network.outbox) == [(10000, [10000])])
+    network.outbox.clear()
+    assert(not network.run() and not network.halted())
+
+    # Pollers count how often they're given empty_input, and send the count on when they get
+    # something else.  The packet gets to each one before it polls, then each polls just once
+    # before the network is idle
+    poller = [3,100, 3,101, 1008,101,-1,102, 1006,102,20, 1001,103,1,103, 1105,1,2, 0,0,
+              1001,100,1,104, 4,104, 4,103, 1105,1,2]
+    network = Network([Computer(poller, inputs=[n]) for n in range(3)], packet_size=2, empty_input=-1)
+    network.send(0, [7])
+    assert(network.run() and list(network.outbox) == [(3, [0])])
+    network.outbox.clear()
+    assert(not network.run())
+    assert([c.get(103) for c in network.computers] == [1, 1, 1])
+
+def test_pause_on_input():
+    # Outputs the sum of each pair of inputs, forever
+    adder = [3,20, 3,21, 1,20,21,22, 4,22, 1105,1,0]
+    p = Computer(adder, pause_on_input=True)
+    assert(p.run() == [] and p.needs_input)
+    p.inputs += [1, 2, 3]
+    assert(p.run() == [3] and p.needs_input)
+    p.inputs += [4, 5, 6]
+    assert(p.run() == [7, 11] and p.needs_input)
+
+    p = Computer(adder, inputs=[1, 2], pause_on_output=True, pause_on_input=True)
+    assert(p.run() == (3, False) and not p.needs_input)
+    assert(p.run() == (None, False) and p.needs_input)
+    p.inputs += [10, 20]
+    assert(p.run() == (30, False))
+
+def test_run_until():
+    # Prints two lines, then outputs each input three times, until it gets a 0
+    program = [104,72, 104,105, 104,10, 104,89, 104,111, 104,10,
+               3,100, 4,100, 4,100, 4,100, 1005,100,12, 99]
+    for pause_on_output in (False, True):
+        p = Computer(program, inputs=[5, 6], pause_on_output=pause_on_output)
+        assert(p.run_until(byte=ord('\n')) == [72, 105, 10] and not p.halted)
+        assert(p.run_until(byte=ord('\n'), n_outputs=2) == [89, 111])
+        assert(p.run_until(n_outputs=2) == [10, 5])
+        assert(p.run_until(input_needed=True) == [5, 5, 6, 6, 6] and p.needs_input and not p.halted)
+        p.inputs.append(0)
+        assert(p.run_until(n_outputs=5) == [0, 0, 0] and p.halted and not p.needs_input)
+
+def test_feed():
+    # Echoes its inputs until it gets a 0
+    echo = [3,100, 4,100, 1005,100,0, 99]
+    p = Computer(echo, inputs=[1])
+    p.feed("Hi")
+    p.feed([2, 3])
+    p.inputs.append(4)
+    p.inputs += [5]
+    p.feed(iter([6, 0]))
+    assert(p.run() == [1, 72, 105, 2, 3, 4, 5, 6, 0])
+
+    # Assigning a list still works, and takes a copy
+    inputs = [7, 0]
+    p = Computer(echo)
+    p.inputs = inputs
+    inputs.append(8)
+    assert(p.run() == [7, 0])
+
+    # Long inputs don't take quadratic time
+    p = Computer(echo)
+    p.feed(range(1, 50001))
+    p.feed([0])
+    assert(len(p.run()) == 50001)
+
+def test_output_sink():
+    # Outputs 1 to 1000
+    count = [1001,100,1,100, 4,100, 1007,100,1000,101, 1005,101,0, 99]
+    seen = []
+    p = Computer(count, output_sink=seen.append)
+    assert(p.run() == [] and seen == list(range(1, 1001)) and p.output_buffer == [])
+
+    # As a generator - which can be stopped early
+    assert(list(Computer(count).outputs(chunk_size=7)) == list(range(1, 1001)))
+    outputs = Computer(count).outputs()
+    assert([next(outputs) for _ in range(3)] == [1, 2, 3])
+    adder = [3,20, 3,21, 1,20,21,22, 4,22, 1105,1,0]
+    assert(list(Computer(adder, inputs=[1, 2, 3, 4], pause_on_input=True).outputs()) == [3, 7])
+
+def test_profile():
+    # Outputs 1 to 1000
+    count = [1001,100,1,100, 4,100, 1007,100,1000,101, 1005,101,0, 99]
+    p = Computer(count, engine="profile")
+    p.run()
+    profile = p.profile
+    assert(profile.steps == 4001 and profile.ip_counts[0] == 1000 and profile.ip_counts[13] == 1)
+    assert(profile.op_counts == {1 : 1000, 4 : 1000, 7 : 1000, 5 : 1000, 99 : 1})
+    assert(profile.reads == {100 : 3000, 101 : 1000} and profile.writes == {100 : 1000, 101 : 1000})
+    assert(profile.report().startswith("Steps: 4001\n\nOpcodes\n"))
+    assert(profile.collapsed(range_size=10).splitlines() == ["intcode;0-9;0 1000", "intcode;0-9;4 1000",
+        "intcode;0-9;6 1000", "intcode;10-19;10 1000", "intcode;10-19;13 1"])
+
+    # Stopping for input doesn't count the input instruction until it's run
+    p = Computer([3,10, 99], engine="profile", pause_on_input=True)
+    p.run()
+    assert(p.profile.steps == 0)
+    p.inputs.append(1)
+    p.run()
+    assert(p.profile.steps == 2 and p.profile.writes == {10 : 1})
+
+def test_trace():
+    global DEBUG
+    DEBUG = True
+    p = Computer([3,20, 1001,20,-1,20, 109,3, 4,20, 1005,20,2, 99])  # Counts down from its input
+    DEBUG = False
+    assert(p.engine == "trace")
+    p.inputs.append(2)
+    trace = io.StringIO()
+    with contextlib.redirect_stdout(trace):
+        assert(p.run() == [1, 0])
+    lines = [line.split() for line in trace.getvalue().splitlines()]
+    assert(lines[0][:4] == ["Running", "from", "ip", "0"])
+    assert(lines[1] == ["0:", "Input", "3,20", "[20]", "=", "2"])
+    assert(lines[2] == ["2:", "Add", "1001,20,-1,20", "[20]", "=", "1"])
+    assert(lines[3] == ["6:", "RelBase", "109,3", "relative", "base", "3"])
+    assert(lines[4] == ["8:", "Output", "4,20", "output", "1"])
+    assert(lines[5] == ["10:", "Jit", "1005,20,2", "jump", "to", "2"])
+    assert(lines[-2] == ["10:", "Jit", "1005,20,2"] and lines[-1] == ["13:", "Terminate", "99", "halt"])
+
+def test_record_replay():
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "session.log")
+    # Running totals of the inputs, with the relative base going up each time round and a write
+    # well past the end of memory
+    image = ProgramImage([109,1, 3,30, 1,30,31,31, 1001,31,0,5000, 4,31, 1105,1,0] + [0] * 15)
+    inputs = [n if n % 2 else -n for n in range(1, 31)]
+    c = Computer(image, pause_on_input=True, engine="classic")
+    recorder = Recorder(c, path, checkpoint_every=20)
+    outputs = []
+    for val in inputs:
+        c.feed([val])
+        outputs += c.run_until(input_needed=True)
+    recorder.close()
+
+    replay = Replay(path)
+    assert(replay.inputs == [(1 + 6*n, val) for n, val in enumerate(inputs)])
+    assert(replay.steps == replay.inputs[-1][0] and c.steps == replay.steps + 6)
+    assert(len(replay.checkpoints) == 8 and replay.checkpoints[0] == (0, 0, 0, 0, []))
+    for engine in ("classic", "fast", "jit"):
+        r = replay.start(image, engine=engine, pause_on_input=True)
+        assert(r.run_until(input_needed=True) == outputs and r.get(5000) == outputs[-1])
+
+    # Seeking anywhere is the same as stepping there from the start
+    for step in (0, 1, 7, 20, 37, 100, replay.steps):
+        expected = Computer(image, inputs=inputs)
+        expected.step(step)
+        r = replay.seek(image, step, engine="fast")
+        state = lambda c: (c.steps, c.ip, c.relative_base, c.get(31), c.get(5000), list(c.inputs))
+        assert(state(r) == state(expected))
+    for step, _ in replay.inputs:
+        r = replay.seek(image, step)
+        assert(r.get(r.ip) == 3)  # About to use the input
+
+    # Carrying on after the last checkpoint
+    r = replay.seek(image, pause_on_input=True)
+    assert(r.run_until(input_needed=True) == outputs[replay.checkpoints[-1].inputs_used:])
+    r.feed([100])
+    assert(r.run_until(input_needed=True) == [outputs[-1] + 100])
+
+    # A log cut short is good up to there
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-1])
+    assert(Replay(path).inputs == replay.inputs[:-1])
+
+    for bad in (lambda: Recorder(Computer(image, engine="fast"), path), lambda: replay.start(ProgramImage([99]))):
+        try:
+            bad()
+            assert(False)
+        except AssertionError as e:
+            assert(str(e).startswith("Recording needs") or str(e).startswith("This session"))
+    shutil.rmtree(folder)
+
+def test_save_load():
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "computer.save")
+    image_path = os.path.join(folder, "totals.intcode")
+    # The running totals from test_record_replay
+    ProgramImage([109,1, 3,30, 1,30,31,31, 1001,31,0,5000, 4,31, 1105,1,0] + [0] * 15).save(image_path)
+    image = ProgramImage.load(image_path)
+    state = lambda c: (c.steps, c.ip, c.relative_base, list(c.inputs), c.output_buffer, c.get(31), c.get(5000), c.halted)
+    for engine in ("classic", "fast", "jit"):
+        for compact in (False, True):
+            c = Computer(image, inputs=[1, -2, 3, 2**70, 5], engine=engine, compact=compact, pause_on_input=True)
+            c.step(20)  # Part way through, with outputs not returned yet
+            assert(c.output_buffer == [1, -1, 2])
+            c.save(path)
+            for loaded in (Computer.load(path, engine=engine, pause_on_input=True),
+                           Computer.load(path, image, compact=compact, pause_on_input=True)):
+                assert(state(loaded) == state(c))
+                assert(loaded.run_until(input_needed=True) == [1, -1, 2, 2**70 + 2, 2**70 + 7])
+                assert(loaded.get(5000) == 2**70 + 7 and loaded.needs_input)
+
+    try:
+        Computer(ProgramImage(list(image))).save(path)
+        Computer.load(path)
+        assert(False)
+    except AssertionError as e:
+        assert(str(e).startswith("Saved from a program that wasn't loaded from an image file"))
+    try:
+        Computer.load(path, ProgramImage([99]))
+        assert(False)
+    except AssertionError as e:
+        assert(str(e) == "Saved from a different program")
+    shutil.rmtree(folder)
 
 def test11_robot():
     drawing_program = [3,8,1005,8,299,1106,0,11,0,0,0,104,1,104,0,3,8,102,-1,8,10,101,1,10,10,4,10,108,1,8,10,4,10,102,1,8,28,1006,0,85,1,106,14,10,3,8,102,-1,8,10,1001,10,1,10,4,10,1008,8,0,10,4,10,101,0,8,58,1,1109,15,10,3,8,1002,8,-1,10,1001,10,1,10,4,10,1008,8,0,10,4,10,1002,8,1,84,3,8,102,-1,8,10,1001,10,1,10,4,10,108,1,8,10,4,10,1002,8,1,105,1006,0,48,3,8,1002,8,-1,10,1001,10,1,10,4,10,108,0,8,10,4,10,102,1,8,130,1006,0,46,1,1001,17,10,3,8,1002,8,-1,10,101,1,10,10,4,10,1008,8,0,10,4,10,1002,8,1,160,2,109,20,10,3,8,102,-1,8,10,1001,10,1,10,4,10,108,0,8,10,4,10,1002,8,1,185,3,8,102,-1,8,10,1001,10,1,10,4,10,108,1,8,10,4,10,1001,8,0,207,1006,0,89,2,1002,6,10,1,1007,0,10,3,8,102,-1,8,10,101,1,10,10,4,10,1008,8,1,10,4,10,101,0,8,241,2,4,14,10,3,8,102,-1,8,10,101,1,10,10,4,10,1008,8,1,10,4,10,101,0,8,267,1,1107,8,10,1,109,16,10,2,1107,4,10,101,1,9,9,1007,9,1003,10,1005,10,15,99,109,621,104,0,104,1,21101,0,387239486208,1,21102,316,1,0,1106,0,420,21101,0,936994976664,1,21102,327,1,0,1105,1,420,3,10,104,0,104,1,3,10,104,0,104,0,3,10,104,0,104,1,3,10,104,0,104,1,3,10,104,0,104,0,3,10,104,0,104,1,21102,1,29192457307,1,21102,1,374,0,1106,0,420,21101,0,3450965211,1,21101,0,385,0,1106,0,420,3,10,104,0,104,0,3,10,104,0,104,0,21102,1,837901103972,1,21101,408,0,0,1106,0,420,21102,867965752164,1,1,21101,0,419,0,1105,1,420,99,109,2,22102,1,-1,1,21102,40,1,2,21102,451,1,3,21102,1,441,0,1106,0,484,109,-2,2106,0,0,0,1,0,0,1,109,2,3,10,204,-1,1001,446,447,462,4,0,1001,446,1,446,108,4,446,10,1006,10,478,1102,0,1,446,109,-2,2105,1,0,0,109,4,1201,-1,0,483,1207,-3,0,10,1006,10,501,21101,0,0,-3,22101,0,-3,1,22102,1,-2,2,21101,1,0,3,21101,520,0,0,1106,0,525,109,-4,2106,0,0,109,5,1207,-3,1,10,1006,10,548,2207,-4,-2,10,1006,10,548,21201,-4,0,-4,1105,1,616,22101,0,-4,1,21201,-3,-1,2,21202,-2,2,3,21101,0,567,0,1106,0,525,22101,0,1,-4,21101,1,0,-1,2207,-4,-2,10,1006,10,586,21102,1,0,-1,22202,-2,-1,-2,2107,0,-3,10,1006,10,608,21202,-1,1,1,21102,608,1,0,106,0,483,21202,-2,-1,-2,22201,-4,-2,-4,109,-5,2105,1,0]
@@ -648,19 +2842,48 @@ def test11_robot():
 .#..#..###.#..#.####.#..#..###..##..####...""")
 
 def tests ():
-    global DEBUG
-    test_day2()
-    test_day5_1_examples()
-    test_day5_1_puzzle()
-    test_day5_2_tests()
-    test_day5_2_puzzle()
-    test_day7()
-
-    # Slow test (6 seconds)
-    #test_day_9()
-
-    test11_robot()
-
+    global DEBUG, DEFAULT_ENGINE
+    for engine in ENGINES:
+        if engine == "trace":
+            continue  # See test_trace
+        DEFAULT_ENGINE = engine
+        test_day2()
+        test_day5_1_examples()
+        test_day5_1_puzzle()
+        test_day5_2_tests()
+        test_day5_2_puzzle()
+        test_day7()
+        test_self_modifying()
+        test_superinstructions()
+        test_relative_mode()
+        test_high_memory()
+        test_fork()
+        test_reset()
+        test_run_batch()
+        test_run_lockstep()
+        test_run_cache()
+        test_async_computer()
+        test_network()
+        test_pause_on_input()
+        test_run_until()
+        test_feed()
+        test_output_sink()
+        test_profile()
+        test_trace()
+        test_record_replay()
+        test_save_load()
+
+        test_compact_memory()
+        test_image_files()
+
+        # Slow test (1 second) - unless using the faster engines
+        if engine in ("fast", "jit"):
+            test_day_9()
+            test_day_9(compact=True)
+
+        test11_robot()
+
+    DEFAULT_ENGINE = "classic"
     print("All tests passed")
 
 if __name__ == "__main__":
@@ -1,262 +1,14 @@
-DEBUG=False
-
-def massert (cond, *args):
-    # My assert - print args and exit if condition is false
-    if not cond:
-        print("\nAssertion!")
-        print("\n".join([str(arg) for arg in args]))
-        assert(False)
-
-class Instruction:
-    @staticmethod
-    def get_instruction (instruction):
-        # Factory
-        opcode = instruction %100
-        modes = instruction // 100
-
-        if DEBUG: print(instruction, opcode, modes)
-
-        return { 1 : AddInstr,
-                 2 : MultInstr,
-                 3 : InputInstr,
-                 4 : OutputInstr,
-                 5 : JitInstr,
-                 6 : JifInstr,
-                 7 : LtInstr,
-                 8 : EqInstr,
-                99 : TerminateInstr }[opcode](modes)
-
-    def __init__ (self, modes):
-        self.modes = modes
-
-        self._params = None
-
-        if DEBUG: print(self.__class__.__name__)
-
-    def get_params (self, program):
-        if self._params is None:
-            self._decode_modes()
-            self._params = self._get_params(program)
-
-        return self._params
-
-    def _get_params (self, program):
-        # override in child class
-        assert(False)
-
-    def _get_single_param (self, program, ip):
-        p = program.get(ip)
-        return self._maybe_deref(p, program)
-
-    def _maybe_deref (self, param, program):
-        # Only works if params are called in order!
-        m = self.modes.pop(0) if self.modes else 0
-
-        if m == 0:
-            return program.get(param)
-        else:
-            return param
-
-    def execute (self, program):
-        # Must override in child class
-        # returns (new ip, continue)
-        assert(False)
-
-    def _decode_modes (self):
-        modesarr = []
-        while self.modes > 0:
-            modesarr.append(self.modes % 10)
-            self.modes //= 10
-
-        self.modes = modesarr
-
-class CombineTwoInstr(Instruction):
-    # Use default init method
-
-    def execute (self, program):
-        # Execute this instruction, modifying the passed-in memory
-        p1,p2,p3 = self.get_params(program)
-
-        program.store(self.combine(p1,p2), p3)
-        return program.ip+4, True
-
-    def combine (self, p1, p2):
-        # override in child class
-        assert(False)
-
-    def _get_params (self, program):
-        # Add or multiply - process 2 params and store at 3rd
-        # Three parameters, starting from the next position after the ip
-        p1 = self._get_single_param(program, program.ip+1)
-        p2 = self._get_single_param(program, program.ip+2)
-        p3 = program.get(program.ip+3)
-
-        return (p1, p2, p3)
-
-class AddInstr(CombineTwoInstr):
-    def combine (self, a, b):
-        return a+b
-
-class MultInstr(CombineTwoInstr):
-    def combine (self, a, b):
-        return a*b
-
-class InputInstr(Instruction):
-    def execute (self, program):
-        val = program.inputs.pop(0)
-        loc = self.get_params(program)[0]
-        program.store(val, loc)
-
-        return program.ip+2, True
-
-    def _get_params (self, program):
-        return (program.get(program.ip+1), )
-
-class OutputInstr(Instruction):
-    # Dummy showing which methods definitely need overriding
-    def execute (self, program):
-        val = self.get_params(program)[0]
-        program.append_to_output(val)
-        return program.ip+2, True
-
-    def _get_params(self, program):
-        p = self._get_single_param(program, program.ip+1)
-        return (p, )
-
-class TerminateInstr(Instruction):
-    # Dummy showing which methods definitely need overriding
-    def execute (self, program):
-        return program.ip+1, False
-
-    def _get_params (self, program):
-        return (None,)
-
-class JumpIfInstr(Instruction):
-    def execute (self, program):
-        test_val, ip_val = self.get_params(program)
-
-        if self.do_test(test_val):
-            next_ip = ip_val
-        else:
-            next_ip = program.ip +3  # Opcode, test val, next ip val
-
-        if DEBUG: print(self.__class__.__name__, test_val, ip_val, "->", next_ip)
-        return next_ip, True
-
-    def _get_params (self, program):
-        ip = program.ip
-
-        return (self._get_single_param(program, ip+1), self._get_single_param(program, ip+2))
-
-class JitInstr(JumpIfInstr):
-    # Jump if true.  If first param is non-zero, set ip to value from second param
-    def do_test (self, val):
-        return val
-
-class JifInstr(JumpIfInstr):
-    # Jump if false.  If first param is zero, set ip to value from second param
-    def do_test (self, val):
-        return not val
-
-class CompareInstr(Instruction):
-    # Compare two values, and store the results in the third location
-    def execute (self, program):
-        t1, t2, loc = self.get_params(program)
-
-        if self._compare(t1,t2):
-            val = 1
-        else:
-            val = 0
-
-        program.store(val, loc)
-        return program.ip+4, True  # instruction, 2 params to compare, 1 store
-
-    def _get_params (self, program):
-        p1 = self._get_single_param(program, program.ip+1)
-        p2 = self._get_single_param(program, program.ip+2)
-        p3 = program.get(program.ip+3)
-        return (p1, p2, p3)
-
-    def _compare (self, a, b):
-        # Override in child class
-        assert(False)
-
-class LtInstr(CompareInstr):
-    def _compare (self, a, b):
-        return a < b
-
-class EqInstr(CompareInstr):
-    def _compare (self, a, b):
-        return a == b
-
-class TemplateInstr(Instruction):
-    # Dummy showing which methods definitely need overriding
-    def execute (self, program):
-        # TODO
-        return next_ip, True
-
-    def _get_params (self, program):
-        # TODO figure out what params you need
-        return (p1, p2, )
-
-
-class Program:
-    def __init__ (self, initial_memory_state, inputs=[], debug=False):
-        self.memory = initial_memory_state
-        self.ip = 0
-        self.inputs = inputs
-        self.output_buffer = ""
-        self.debug = debug
-
-    def append_to_output (self, val):
-        # Output
-        if len(self.output_buffer) > 0: self.output_buffer += " "
-        self.output_buffer += str(val)
-        if DEBUG: print("Output updated:\t", self.output_buffer)
-
-    def store (self, val, loc):
-        if loc >= len(self.memory):
-            print("Store outside memory buffer: {} with memory of length {}".format(loc, len(self.memory)))
-            exit(1)
-
-        self.memory[loc] = val
-        if DEBUG: print("Update ({}->{}):\t".format(loc,val), self.memory)
-
-    def get (self, ix):
-        return self.memory[ix]
-
-    #def set (self, ix, val):
-    #    self.memory[ix] = val
-    #    if DEBUG: print self.memory
-
-    def run(self):
-        if DEBUG: print("Starting prog:\t", self.memory,"\n  with inputs:\t", self.inputs)
-        carry_on = True
-        try:
-            while carry_on:
-                if DEBUG: print("ip:",self.ip,"\t")
-                this_instr = self.get(self.ip)
-                instr = Instruction.get_instruction(this_instr)
-                self.ip, carry_on = instr.execute(self)
-                #if DEBUG: print self.ip, this_instr, "\t", "%30s"%self.output_buffer, "\t", self.memory
-        except:
-            raise
-        finally:
-            if self.output_buffer:
-                print("Output:", self.output_buffer)
-
-    def display(self, debug=False):
-        print(self.memory)
-        if debug:
-            print(self.ip)
-            print()
+# Day 5 - runs on the Intcode computer in computer.py, as it was on day 5 (no relative base)
+from computer import Computer
 
 def test (program, inputs=None, output=None, expected_mem=None, expected_mem_len=None):
-    p = Program(program, inputs=inputs)
-    p.run()
+    p = Computer(program, inputs=inputs, relative_mode=False)
+    p_out = " ".join([str(o) for o in p.run()])
+    if p_out:
+        print("Output:", p_out)
 
     if output:
-        assert(p.output_buffer == output)
+        assert(p_out == output)
 
     if expected_mem:
         if not expected_mem_len:
@@ -1,270 +1,10 @@
-DEBUG=False
+# Day 7 - runs on the Intcode computer in computer.py, as it was on day 7 (no relative base)
+from computer import Computer
 
-def massert (cond, *args):
-    # My assert - print args and exit if condition is false
-    if not cond:
-        print("\nAssertion!")
-        print("\n".join([str(arg) for arg in args]))
-        assert(False)
-
-class Instruction:
-    @staticmethod
-    def get_instruction (instruction):
-        # Factory
-        opcode = instruction %100
-        modes = instruction // 100
-
-        if DEBUG: print(instruction, opcode, modes)
-
-        return { 1 : AddInstr,
-                 2 : MultInstr,
-                 3 : InputInstr,
-                 4 : OutputInstr,
-                 5 : JitInstr,
-                 6 : JifInstr,
-                 7 : LtInstr,
-                 8 : EqInstr,
-                99 : TerminateInstr }[opcode](modes)
-
-    def __init__ (self, modes):
-        self.modes = modes
-
-        self._params = None
-
-        if DEBUG: print(self.__class__.__name__)
-
-    def get_params (self, program):
-        if self._params is None:
-            self._decode_modes()
-            self._params = self._get_params(program)
-
-        return self._params
-
-    def _get_params (self, program):
-        # override in child class
-        assert(False)
-
-    def _get_single_param (self, program, ip):
-        p = program.get(ip)
-        return self._maybe_deref(p, program)
-
-    def _maybe_deref (self, param, program):
-        # Only works if params are called in order!
-        m = self.modes.pop(0) if self.modes else 0
-
-        if m == 0:
-            return program.get(param)
-        else:
-            return param
-
-    def execute (self, program):
-        # Must override in child class
-        # returns (new ip, continue)
-        assert(False)
-
-    def _decode_modes (self):
-        modesarr = []
-        while self.modes > 0:
-            modesarr.append(self.modes % 10)
-            self.modes //= 10
-
-        self.modes = modesarr
-
-class CombineTwoInstr(Instruction):
-    # Use default init method
-
-    def execute (self, program):
-        # Execute this instruction, modifying the passed-in memory
-        p1,p2,p3 = self.get_params(program)
-
-        program.store(self.combine(p1,p2), p3)
-        return program.ip+4, True
-
-    def combine (self, p1, p2):
-        # override in child class
-        assert(False)
-
-    def _get_params (self, program):
-        # Add or multiply - process 2 params and store at 3rd
-        # Three parameters, starting from the next position after the ip
-        p1 = self._get_single_param(program, program.ip+1)
-        p2 = self._get_single_param(program, program.ip+2)
-        p3 = program.get(program.ip+3)
-
-        return (p1, p2, p3)
-
-class AddInstr(CombineTwoInstr):
-    def combine (self, a, b):
-        try:
-            return a+b
-        except TypeError:
-            print(a)
-            print(b)
-            print(self)
-            raise
-
-class MultInstr(CombineTwoInstr):
-    def combine (self, a, b):
-        return a*b
-
-class InputInstr(Instruction):
-    def execute (self, program):
-        val = program.inputs.pop(0)
-        loc = self.get_params(program)[0]
-        program.store(val, loc)
-
-        return program.ip+2, True
-
-    def _get_params (self, program):
-        return (program.get(program.ip+1), )
-
-class OutputInstr(Instruction):
-    # Dummy showing which methods definitely need overriding
-    def execute (self, program):
-        val = self.get_params(program)[0]
-        program.append_to_output(val)
-        return program.ip+2, True
-
-    def _get_params(self, program):
-        p = self._get_single_param(program, program.ip+1)
-        return (p, )
-
-class TerminateInstr(Instruction):
-    # Dummy showing which methods definitely need overriding
-    def execute (self, program):
-        return program.ip+1, False
-
-    def _get_params (self, program):
-        return (None,)
-
-class JumpIfInstr(Instruction):
-    def execute (self, program):
-        test_val, ip_val = self.get_params(program)
-
-        if self.do_test(test_val):
-            next_ip = ip_val
-        else:
-            next_ip = program.ip +3  # Opcode, test val, next ip val
-
-        if DEBUG: print(self.__class__.__name__, test_val, ip_val, "->", next_ip)
-        return next_ip, True
-
-    def _get_params (self, program):
-        ip = program.ip
-
-        return (self._get_single_param(program, ip+1), self._get_single_param(program, ip+2))
-
-class JitInstr(JumpIfInstr):
-    # Jump if true.  If first param is non-zero, set ip to value from second param
-    def do_test (self, val):
-        return val
-
-class JifInstr(JumpIfInstr):
-    # Jump if false.  If first param is zero, set ip to value from second param
-    def do_test (self, val):
-        return not val
-
-class CompareInstr(Instruction):
-    # Compare two values, and store the results in the third location
-    def execute (self, program):
-        t1, t2, loc = self.get_params(program)
-
-        if self._compare(t1,t2):
-            val = 1
-        else:
-            val = 0
-
-        program.store(val, loc)
-        return program.ip+4, True  # instruction, 2 params to compare, 1 store
-
-    def _get_params (self, program):
-        p1 = self._get_single_param(program, program.ip+1)
-        p2 = self._get_single_param(program, program.ip+2)
-        p3 = program.get(program.ip+3)
-        return (p1, p2, p3)
-
-    def _compare (self, a, b):
-        # Override in child class
-        assert(False)
-
-class LtInstr(CompareInstr):
-    def _compare (self, a, b):
-        return a < b
-
-class EqInstr(CompareInstr):
-    def _compare (self, a, b):
-        return a == b
-
-class TemplateInstr(Instruction):
-    # Dummy showing which methods definitely need overriding
-    def execute (self, program):
-        # TODO
-        return next_ip, True
-
-    def _get_params (self, program):
-        # TODO figure out what params you need
-        return (p1, p2, )
-
-
-class Program:
-    def __init__ (self, initial_memory_state, inputs=[], pause_on_output=False):
-        self.memory = list(initial_memory_state)
-        self.ip = 0
-        self.inputs = inputs
-        self.output_buffer = []
-        self.new_output = False
-        self.pause_on_output = pause_on_output
-
-    def append_to_output (self, val):
-        # Output
-        self.output_buffer.append(val)
-        if DEBUG: print("Output updated:\t", " ".join([str(o) for o in self.output_buffer]))
-        self.new_output = True
-
-    def store (self, val, loc):
-        if loc >= len(self.memory):
-            print("Store outside memory buffer: {} with memory of length {}".format(loc, len(self.memory)))
-            exit(1)
-
-        self.memory[loc] = val
-        if DEBUG: print("Update ({}->{}):\t".format(loc,val), self.memory)
-
-    def get (self, ix):
-        return self.memory[ix]
-
-    def run(self):
-        if DEBUG: print("Starting prog:\t", self.memory,"\n  with inputs:\t", self.inputs)
-        carry_on = True
-        try:
-            while carry_on:
-                if DEBUG: print("ip:",self.ip,"\t")
-                this_instr = self.get(self.ip)
-                instr = Instruction.get_instruction(this_instr)
-                self.ip, carry_on = instr.execute(self)
-
-                if carry_on and self.pause_on_output and self.new_output:
-                    # Send the output and then pause
-                    output = self.output_buffer[0]
-                    self.output_buffer = []
-                    self.new_output = False
-                    if DEBUG: print("Interim output:", output)
-                    return output
-        except:
-            raise
-        finally:
-            if self.output_buffer:
-                if DEBUG: print("Output:", self.output_buffer)
-
-        return self.output_buffer
-
-    def display(self, debug=False):
-        print(self.memory)
-        if debug:
-            print(self.ip)
-            print()
+DEBUG=False
 
 def test (program, inputs=None, output=None, expected_mem=None, expected_mem_len=None):
-    p = Program(program, inputs=inputs)
+    p = Computer(program, inputs=inputs, relative_mode=False)
     p_out = p.run()
 
     if output:
@@ -392,71 +132,24 @@ def find_largest_output (limits, program, fun):
     return biggest_output, best_order
 
 def day7part1fun(program, aa,bb,cc,dd,ee):
-    ampA = Program(program, inputs=[aa, 0])
-    outA = ampA.run()[0]
-
-    ampB = Program(program, inputs=[bb, outA])
-    outB = ampB.run()[0]
-
-    ampC = Program(program, inputs=[cc, outB])
-    outC = ampC.run()[0]
-
-    ampD = Program(program, inputs=[dd, outC])
-    outD = ampD.run()[0]
-
-    ampE = Program(program, inputs=[ee, outD])
-    outE = ampE.run()[0]
+    output = 0
+    for phase in (aa,bb,cc,dd,ee):
+        output = Computer(program, inputs=[phase, output], relative_mode=False).run()[0]
 
-    return outE
+    return output
 
 def day7part2fun(program, aa,bb,cc,dd,ee):
-    # Assumes loop runs through more than once
-    ampA = Program(program, inputs=[aa, 0], pause_on_output=True)
-    outA = ampA.run()
-    ampB = Program(program, inputs=[bb, outA], pause_on_output=True)
-    outB = ampB.run()
-    ampC = Program(program, inputs=[cc, outB], pause_on_output=True)
-    outC = ampC.run()
-    ampD = Program(program, inputs=[dd, outC], pause_on_output=True)
-    outD = ampD.run()
-    ampE = Program(program, inputs=[ee, outD], pause_on_output=True)
-    outE = ampE.run()
-
-    finalE = outE
-
-    halting = False
-    while not halting:
-        ampA.inputs.append(outE)
-        outA = ampA.run()
-        if type(outA) == list:
-            halting = True
-            if outA: outA = outA[0]
-
-        if outA: ampB.inputs.append(outA)
-        outB = ampB.run()
-        if halting:
-            assert(type(outB) == list)
-            if outB: outB = outB[0]
-
-        if outB: ampC.inputs.append(outB)
-        outC = ampC.run()
-        if halting:
-            assert(type(outC) == list)
-            if outC: outC = outC[0]
-
-        if outC: ampD.inputs.append(outC)
-        outD = ampD.run()
-        if halting:
-            assert(type(outD) == list)
-            if outD: outD = outD[0]
-
-        if outD: ampE.inputs.append(outD)
-        outE = ampE.run()
-        if halting:
-            assert(type(outE) == list)
-            return finalE
-        else:
-            finalE=outE
+    # Feedback loop - each amplifier's output goes to the next, until they halt.  The answer is
+    # the last thing E output.
+    amps = [Computer(program, inputs=[phase], pause_on_output=True, relative_mode=False) for phase in (aa,bb,cc,dd,ee)]
+    signal = 0
+    while True:
+        for amp in amps:
+            amp.feed([signal])
+            output, halted = amp.run()
+            if halted:
+                return signal
+            signal = output
 
 
 #DAY_7_PROGRAM = [3,8,1001,8,10,8,105,1,0,0,21,34,55,68,93,106,187,268,349,430,99999,3,9,102,5,9,9,1001,9,2,9,4,9,99,3,9,1001,9,5,9,102,2,9,9,101,2,9,9,102,2,9,9,4,9,99,3,9,101,2,9,9,102,4,9,9,4,9,99,3,9,101,4,9,9,102,3,9,9,1001,9,2,9,102,4,9,9,1001,9,2,9,4,9,99,3,9,101,2,9,9,1002,9,5,9,4,9,99,3,9,101,1,9,9,4,9,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,101,2,9,9,4,9,3,9,1001,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,102,2,9,9,4,9,3,9,1002,9,2,9,4,9,3,9,101,1,9,9,4,9,99,3,9,101,2,9,9,4,9,3,9,1001,9,1,9,4,9,3,9,101,1,9,9,4,9,3,9,1001,9,1,9,4,9,3,9,1001,9,2,9,4,9,3,9,102,2,9,9,4,9,3,9,1001,9,1,9,4,9,3,9,102,2,9,9,4,9,3,9,1001,9,1,9,4,9,3,9,101,2,9,9,4,9,99,3,9,102,2,9,9,4,9,3,9,102,2,9,9,4,9,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,101,1,9,9,4,9,3,9,101,1,9,9,4,9,3,9,101,1,9,9,4,9,3,9,101,2,9,9,4,9,3,9,1001,9,2,9,4,9,99,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,1001,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,101,2,9,9,4,9,3,9,1001,9,2,9,4,9,3,9,101,1,9,9,4,9,3,9,101,1,9,9,4,9,3,9,101,1,9,9,4,9,99,3,9,101,2,9,9,4,9,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,101,1,9,9,4,9,3,9,1001,9,1,9,4,9,3,9,101,2,9,9,4,9,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,3,9,1002,9,2,9,4,9,99]
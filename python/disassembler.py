@@ -0,0 +1,385 @@
+# Static analysis of an Intcode program: disassembly, basic blocks, calls and returns, code vs data
+#   python disassembler.py program        prints a listing of a program - an image file (like
+#                                         day23.intcode) or comma separated text
+#   python disassembler.py                runs the tests
+# The program is followed from its entry points (recursive descent) rather than decoded word by
+# word, so the tables of numbers that sit after the code don't come out as nonsense instructions.
+# Jumps with a computed target can't be followed, except for two patterns the puzzle programs
+# are full of:
+#   call    21101 ret 0 0 / 1105 1 target   - store the return address at [rb+0] and jump
+#           (any add or mul of two immediates into a relative address, then an unconditional jump
+#           to an immediate target, where the value stored is the address after the jump)
+#   return  2106 0 0 (or 2105 1 0)          - jump to the address stored at [rb+0]
+# with "109 x" at the start and end of a function moving the relative base over its frame.
+# A jump table (day23's NIC dispatches on its input through one) is found by looking for runs
+# of words that aren't code but that all point at plausible instructions.
+import os, shutil, sys, tempfile, time
+from collections import namedtuple
+from computer import IMAGE_MAGIC, Instruction, PARAM_USES, ProgramImage
+
+MNEMONICS = { 1 : "add", 2 : "mul", 3 : "in", 4 : "out", 5 : "jt", 6 : "jf", 7 : "lt", 8 : "eq", 9 : "arb", 99 : "halt" }
+TABLE_MIN = 4  # Fewer words than this in a row aren't taken as a jump table
+CALL_LOOKBACK = 8  # How many instructions before a jump to look for its return address being stored
+
+class Op(namedtuple("Op", "addr word code modes params")):
+    # params are the raw words after the instruction word, one per mode
+    @property
+    def size (self):
+        return 1 + len(self.params)
+
+    @property
+    def end (self):
+        return self.addr + 1 + len(self.params)
+
+    def text (self):
+        def param(p, m):
+            if m == 0: return "[{}]".format(p)
+            if m == 1: return str(p)
+            return "[rb{:+d}]".format(p)
+        return " ".join([MNEMONICS[self.code]] + [param(p, m) for p, m in zip(self.params, self.modes)])
+
+# end is exclusive.  exits are where control can go after the block's last instruction, with None
+# for a jump whose target isn't known; a call's exits are its target, not its return address.
+Block = namedtuple("Block", "start end exits")
+
+def decode (program, addr):
+    # The instruction at addr, or None if the word there can't be one
+    if not 0 <= addr < len(program): return None
+    word = program[addr]
+    code = word % 100
+    if word < 0 or code not in PARAM_USES: return None
+    uses = PARAM_USES[code]
+    if word // 10 ** (2 + len(uses)): return None  # Modes for parameters it doesn't have
+    modes = Instruction._decode_modes(word // 100)[:len(uses)]
+    for m, use in zip(modes, uses):
+        if m > 2 or (m == 1 and use == "w"): return None
+    if addr + len(uses) >= len(program): return None
+    return Op(addr, word, code, modes, tuple(program[addr+1:addr+1+len(uses)]))
+
+class Disassembly:
+    def __init__ (self, program, entries=(0,), tables=True):
+        # tables=False only follows jumps to immediate targets and calls, not tables and pointers
+        self.program = program
+        self.ops = {}  # address -> Op, for every instruction found
+        self.jump_targets = set()  # Immediate targets of jumps (and of jump tables)
+        self.calls = {}  # address of the jump -> (target, or None if computed, return address)
+        self.functions = {}  # call target -> the relative base adjustment it starts with (0 if none)
+        self.returns = set()  # addresses of return instructions
+        self.indirect = set()  # addresses of other jumps with computed targets
+        self.tables = {}  # address of a jump table -> the targets in it
+        self.pointers = {}  # address of a computed jump -> the constants its target cell is set to
+        self.patches = {}  # address of an instruction -> the code address it writes to
+        self.bad = set()  # entry points that didn't decode, or ran into another instruction
+        self.entries = set(entries)
+
+        self._owner = [None] * len(program)  # code word -> address of its instruction
+        self._exits = {}  # address of the last instruction of a block -> exits
+        todo = list(entries)
+        while todo:
+            self._follow(todo)
+            todo = self._find_calls()
+            self._find_patches()
+            if not todo and tables:
+                todo = self._find_tables() + self._find_pointers()
+
+        self._find_functions()
+        self.blocks = self._find_blocks()
+
+    def _follow (self, todo):
+        program, ops, owner = self.program, self.ops, self._owner
+        while todo:
+            addr = todo.pop()
+            while True:
+                if addr in ops: break
+                op = decode(program, addr)
+                if op is None or any(owner[a] is not None for a in range(addr, op.end)):
+                    self.bad.add(addr)
+                    break
+                ops[addr] = op
+                for a in range(addr, op.end):
+                    owner[a] = addr
+
+                exits = self._successors(op)
+                if exits == [op.end]:
+                    addr = op.end
+                    continue
+                self._exits[addr] = exits
+                todo.extend(a for a in exits if a is not None)
+                break
+
+    def _successors (self, op):
+        if op.code == 99: return []
+        if op.code not in (5, 6): return [op.end]
+
+        (cond, target), (cond_mode, target_mode) = op.params, op.modes[:2]
+        taken = falls = True
+        if cond_mode == 1:
+            taken = (cond != 0) == (op.code == 5)
+            falls = not taken
+
+        exits = []
+        if taken:
+            if target_mode == 1:
+                self.jump_targets.add(target)
+                exits.append(target)
+            else:
+                if target_mode == 2 and target == 0 and not falls:
+                    self.returns.add(op.addr)
+                else:
+                    self.indirect.add(op.addr)
+                exits.append(None)
+        if falls:
+            exits.append(op.end)
+        return exits
+
+    def _find_calls (self):
+        # Return addresses that haven't been followed yet.  The return address can be stored a few
+        # instructions before the jump, with the arguments, and the jump itself can be computed.
+        todo = []
+        for addr, exits in self._exits.items():
+            op = self.ops[addr]
+            if addr in self.calls or addr in self.returns or op.code not in (5, 6) or len(exits) != 1: continue
+            before = addr
+            for _ in range(CALL_LOOKBACK):
+                if before == 0 or self._owner[before - 1] is None: break
+                before = self._owner[before - 1]
+                if before in self._exits: break
+                store = self.ops[before]
+                if store.code not in (1, 2) or store.modes != (1, 1, 2): continue
+                a, b, _ = store.params
+                if (a + b if store.code == 1 else a * b) == op.end:
+                    self.calls[addr] = (exits[0], op.end)
+                    if op.end not in self.ops:
+                        todo.append(op.end)
+                    break
+        return todo
+
+    def _plausible (self, addr, after):
+        # Could a jump table at after send control to addr?  The tables only ever jump forwards.
+        if not after < addr < len(self.program): return False
+        if addr in self.ops: return True
+        return self._owner[addr] is None and decode(self.program, addr) is not None
+
+    def _find_tables (self):
+        # A computed jump to [p], where the program patches p to be "something + base", jumps
+        # through a table at base.  The table runs for as long as its words look like code addresses.
+        todo = []
+        for writer, cell in list(self.patches.items()):
+            jump = self._owner[cell]
+            op, store = self.ops[jump], self.ops[writer]
+            if jump not in self.indirect or cell != jump + 2 or op.modes[1] != 0 or store.code != 1: continue
+            bases = [p for p, m in zip(store.params[:2], store.modes) if m == 1]
+            if len(bases) != 1 or bases[0] in self.tables: continue
+            start = addr = bases[0]
+            while 0 <= addr < len(self.program) and self._owner[addr] is None and self._plausible(self.program[addr], jump):
+                addr += 1
+            if addr - start < TABLE_MIN: continue
+            targets = list(self.program[start:addr])
+            self.tables[start] = targets
+            self.jump_targets.update(targets)
+            todo += [t for t in targets if t not in self.ops]
+        return todo
+
+    def _find_pointers (self):
+        # A computed jump to [p], where every store to p is of a constant, can only go to those
+        # constants - day23's NIC keeps its packet handlers' addresses in memory like this
+        stores = {}
+        for addr, op in self.ops.items():
+            if op.code in (1, 2) and op.modes == (1, 1, 0):
+                a, b, dest = op.params
+                stores.setdefault(dest, set()).add(a + b if op.code == 1 else a * b)
+        todo = []
+        for addr in self.indirect:
+            op = self.ops[addr]
+            if op.modes[1] != 0 or op.params[1] in self.patches.values(): continue
+            for target in stores.get(op.params[1], ()):
+                if 0 <= target < len(self.program) and target not in self.pointers.setdefault(addr, set()):
+                    self.pointers[addr].add(target)
+                    self.jump_targets.add(target)
+                    if target not in self.ops:
+                        todo.append(target)
+        return todo
+
+    def _find_functions (self):
+        for target, _ in self.calls.values():
+            op = self.ops.get(target)
+            self.functions[target] = op.params[0] if op and op.code == 9 and op.modes[0] == 1 else 0
+
+    def _find_patches (self):
+        # Writes to a fixed address that's part of an instruction: self-modifying code
+        for addr, op in self.ops.items():
+            uses = PARAM_USES[op.code]
+            for p, m, use in zip(op.params, op.modes, uses):
+                if use == "w" and m == 0 and 0 <= p < len(self.program) and self._owner[p] is not None:
+                    self.patches[addr] = p
+
+    def _find_blocks (self):
+        leaders = set(self.entries) | self.jump_targets | {ret for _, ret in self.calls.values()}
+        blocks = {}
+        start = None
+        for addr in sorted(self.ops):
+            op = self.ops[addr]
+            if start is None or addr in leaders or addr != prev_end:
+                if start is not None:
+                    blocks[start] = Block(start, prev_end, [addr] if addr == prev_end else [])
+                start = addr
+            if addr in self._exits:
+                blocks[start] = Block(start, op.end, self._exits[addr])
+                start = None
+            prev_end = op.end
+        if start is not None:
+            blocks[start] = Block(start, prev_end, [])
+        return blocks
+
+    def is_code (self, addr):
+        return self._owner[addr] is not None
+
+    def data_ranges (self):
+        # (start, end) for every run of words not reached as code, end exclusive
+        ranges = []
+        start = None
+        for addr, owner in enumerate(self._owner):
+            if owner is None and start is None:
+                start = addr
+            elif owner is not None and start is not None:
+                ranges.append((start, addr))
+                start = None
+        if start is not None:
+            ranges.append((start, len(self._owner)))
+        return ranges
+
+    def listing (self):
+        lines = []
+        data = dict(self.data_ranges())
+        addr, n = 0, len(self.program)
+        while addr < n:
+            if addr in data:
+                end = data[addr]
+                kind = "table" if addr in self.tables else "data"
+                for a in range(addr, end, 8):
+                    lines.append("{:6}: {} {}".format(a, kind, ", ".join(str(w) for w in self.program[a:min(a+8, end)])))
+                addr = end
+                continue
+            op = self.ops[addr]
+            if addr in self.blocks:
+                lines.append("")
+                if addr in self.functions: lines.append("      function {}".format(addr))
+            note = ""
+            if addr in self.calls:
+                target, ret = self.calls[addr]
+                note = "call {}, returning to {}".format("computed" if target is None else target, ret)
+            elif addr in self.returns: note = "return"
+            elif addr in self.indirect: note = "computed jump"
+            elif addr in self.patches: note = "patches {}".format(self.patches[addr])
+            lines.append("{:6}: {:32}{}".format(addr, op.text(), "; " + note if note else ""))
+            addr = op.end
+        return "\n".join(lines)
+
+# Tests
+def load (path):
+    # The program in path - an image file (see ProgramImage.save) or comma separated text
+    with open(path, "rb") as f:
+        is_image = f.read(len(IMAGE_MAGIC)) == IMAGE_MAGIC
+    if is_image:
+        return list(ProgramImage.load(path))
+    with open(path) as f:
+        return [int(x) for x in f.read().split(",")]
+
+def test_decode ():
+    assert decode([1002, 4, 3, 4, 33], 0) == Op(0, 1002, 2, (0, 1, 0), (4, 3, 4))
+    assert decode([1002, 4, 3, 4, 33], 0).text() == "mul [4] 3 [4]"
+    assert decode([21101, 5, 0, -1], 0).text() == "add 5 0 [rb-1]"
+    assert decode([99], 0).size == 1
+    assert decode([11101, 1, 2, 3], 0) is None  # Immediate write
+    assert decode([1, 2, 3], 0) is None  # Runs off the end
+    assert decode([12, 0, 0], 0) is None
+    assert decode([100004, 0], 0) is None
+    assert decode([-1], 0) is None
+
+def test_blocks ():
+    # input, jump over some data if it's not zero, output the data or the input, halt
+    program = [3, 20, 1005, 20, 9, 104, 7, 99, 42, 4, 20, 99]
+    d = Disassembly(program)
+    assert sorted(d.ops) == [0, 2, 5, 7, 9, 11]
+    assert d.data_ranges() == [(8, 9)]
+    assert not d.is_code(8) and d.is_code(6)
+    assert d.jump_targets == {9}
+    assert sorted(d.blocks.values()) == [(0, 5, [9, 5]), (5, 8, []), (9, 12, [])]
+
+def test_calls ():
+    # main calls f twice; f has a frame of 2 and returns.  f's return goes via the stack, so
+    # the code after each call is only found by recognising the call
+    program = [109, 100,
+               21101, 9, 0, 0, 1105, 1, 17,  # 2: call 17, returning to 9
+               21101, 16, 0, 0, 1105, 1, 17,  # 9: call 17, returning to 16
+               99,
+               109, 2, 104, 1, 109, -2, 2106, 0, 0]
+    d = Disassembly(program)
+    assert d.calls == {6: (17, 9), 13: (17, 16)}
+    assert d.functions == {17: 2}
+    assert d.returns == {23}
+    assert not d.indirect
+    assert d.data_ranges() == []
+    assert sorted(d.blocks) == [0, 9, 16, 17]
+    assert d.blocks[17].exits == [None]
+
+def test_jump_table ():
+    # Output 0-3 depending on the input, by patching the jump to read table[input]
+    program = [3, 100, 1001, 100, 9, 8, 105, 1, 0,  # 0: mem[8] = input + 9, jump to mem[mem[8]]
+               13, 16, 19, 22,  # 9: the table
+               104, 0, 99, 104, 1, 99, 104, 2, 99, 104, 3, 99]
+    d = Disassembly(program)
+    assert d.indirect == {6}
+    assert d.patches == {2: 8}
+    assert d.tables == {9: [13, 16, 19, 22]}
+    assert sorted(d.ops) == [0, 2, 6, 13, 15, 16, 18, 19, 21, 22, 24]
+    assert d.data_ranges() == [(9, 13)]
+    assert not Disassembly(program, tables=False).tables
+
+def test_puzzles ():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench"))
+    import programs
+
+    # The drone's probe calls through a computed address once, and keeps a few variables after its code
+    d = Disassembly(programs.day19())
+    assert not d.bad and d.indirect == {192} and d.calls[192] == (None, 195)
+    assert d.data_ranges() == [(221, 225)]
+
+    # The NIC's routing table gets found, and through it most of the program, along with the
+    # handlers it calls through a pointer
+    program = programs.day23()
+    start = time.perf_counter()
+    d = Disassembly(program)
+    took = time.perf_counter() - start
+    assert list(d.tables) == [11] and len(d.tables[11]) == 50
+    assert d.indirect == {8, 207} and d.patches[2] == 10
+    assert d.pointers == {207: {253, 302, 351, 556}}
+    assert (385, 436) in d.data_ranges()  # Powers of two
+    assert sum(op.size for op in d.ops.values()) > len(program) // 2
+    print("day23 NIC, {} words: {} instructions, {} blocks in {:.1f}ms".format(
+        len(program), len(d.ops), len(d.blocks), took * 1000))
+
+def test_load ():
+    # Image files and text give the same program
+    folder = tempfile.mkdtemp()
+    program = [1101,2,3,7, 4,7, 99, 0]
+    ProgramImage(program).save(os.path.join(folder, "program.intcode"))
+    with open(os.path.join(folder, "program.txt"), "w") as f:
+        f.write(",".join(map(str, program)) + "\n")
+    assert load(os.path.join(folder, "program.intcode")) == load(os.path.join(folder, "program.txt")) == program
+    shutil.rmtree(folder)
+
+def tests ():
+    test_decode()
+    test_load()
+    test_blocks()
+    test_calls()
+    test_jump_table()
+    test_puzzles()
+    print("All tests passed")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        print(Disassembly(load(sys.argv[1])).listing())
+    else:
+        tests()